@@ -7,35 +7,35 @@ Run this to obtain access token:
 Then visit: http://localhost:8000
 """
 
-from flask import Flask, request, redirect
+from flask import Flask, Response, request, redirect, session
+from functools import lru_cache
+import hmac
 import secrets
 import os
-from dotenv import load_dotenv, set_key
+import tempfile
+from string import Template
+from dotenv import load_dotenv
+from dotenv.parser import parse_stream
 
 load_dotenv()
 
-# Import after loading env
-from src.tiktok_real_api import TikTokOAuth
-
 app = Flask(__name__)
+# Signs the session cookie that carries each browser's OAuth state
+app.secret_key = os.getenv('FLASK_SECRET_KEY') or secrets.token_urlsafe(32)
 
 # Configuration
 APP_ID = os.getenv('TIKTOK_APP_ID', '')
 APP_SECRET = os.getenv('TIKTOK_APP_SECRET', '')
 REDIRECT_URI = "http://localhost:8000/callback"
+ENV_PATH = '.env'
 
-# OAuth handler
-oauth_handler = None
-oauth_state = secrets.token_urlsafe(32)
+# Credentials only change on restart, so check them once
+_CREDS_OK = bool(APP_ID) and bool(APP_SECRET)
 
+# HTML pages, built once at import; only the callback pages vary per request
+HTML_CONTENT_TYPE = 'text/html; charset=utf-8'
 
-@app.route('/')
-def home():
-    """Home page with instructions"""
-    global oauth_handler
-    
-    if not APP_ID or not APP_SECRET:
-        return '''
+_CONFIG_MISSING_PAGE = '''
         <h1>❌ Configuration Missing</h1>
         <p>Add TIKTOK_APP_ID and TIKTOK_APP_SECRET to .env file</p>
         <pre>
@@ -43,11 +43,9 @@ TIKTOK_APP_ID=your_app_id
 TIKTOK_APP_SECRET=your_app_secret
         </pre>
         <p>Then restart this server</p>
-        '''
-    
-    oauth_handler = TikTokOAuth(APP_ID, APP_SECRET, REDIRECT_URI)
-    
-    return f'''
+'''.encode('utf-8')
+
+_HOME_PAGE = Template('''
     <html>
     <head><title>TikTok OAuth</title></head>
     <body style="font-family: Arial; max-width: 800px; margin: 50px auto; padding: 20px;">
@@ -55,8 +53,8 @@ TIKTOK_APP_SECRET=your_app_secret
         
         <div style="background: #f0f0f0; padding: 20px; border-radius: 5px; margin: 20px 0;">
             <h3>Current Configuration:</h3>
-            <p>App ID: <code>{APP_ID}</code></p>
-            <p>Redirect URI: <code>{REDIRECT_URI}</code></p>
+            <p>App ID: <code>$app_id</code></p>
+            <p>Redirect URI: <code>$redirect_uri</code></p>
             <p><strong>⚠️ Ensure this redirect URI is in TikTok Developer Dashboard!</strong></p>
         </div>
         
@@ -77,16 +75,116 @@ TIKTOK_APP_SECRET=your_app_secret
         </div>
     </body>
     </html>
-    '''
+''').substitute(app_id=APP_ID, redirect_uri=REDIRECT_URI).encode('utf-8')
+
+_SUCCESS_TMPL = Template('''
+        <html>
+        <body style="font-family: Arial; max-width: 800px; margin: 50px auto;">
+            <h1>🎉 OAuth Successful!</h1>
+            <div style="background: #e8f5e9; padding: 20px; border-radius: 5px;">
+                <h3>✅ Credentials Saved</h3>
+                <p>Access Token: <code>$token_prefix...</code></p>
+                <p>Advertiser ID: <code>$advertiser_id</code></p>
+            </div>
+            
+            <div style="background: #fff3cd; padding: 20px; border-radius: 5px; margin-top: 20px;">
+                <h3>🚀 Next Steps:</h3>
+                <ol>
+                    <li>Stop this server (Ctrl+C)</li>
+                    <li>Run: <code>python -m src.main</code></li>
+                    <li>Agent will use REAL TikTok API!</li>
+                </ol>
+            </div>
+        </body>
+        </html>
+''')
+
+_FAILURE_TMPL = Template('''
+        <h1>❌ Token Exchange Failed</h1>
+        <p>$message</p>
+        <a href="/">Try Again</a>
+''')
+
+_NO_CODE_PAGE = '<h1>❌ No authorization code received</h1><a href="/">Try Again</a>'.encode('utf-8')
+_INVALID_STATE_PAGE = '<h1>❌ Invalid state - security error</h1><a href="/">Try Again</a>'.encode('utf-8')
+
+
+def _html(body: bytes) -> Response:
+    """Wrap an already-encoded HTML body in a response"""
+    return Response(body, content_type=HTML_CONTENT_TYPE)
+
+
+def _quote_env_value(value: str) -> str:
+    """Quote a value the same way python-dotenv's set_key does"""
+    escaped = value.replace('\\', '\\\\').replace("'", "\\'")
+    return f"'{escaped}'"
+
+
+def _write_env_batch(updates: dict) -> None:
+    """
+    Apply several key updates to .env in a single pass
+    
+    Reads the file once, replaces matching keys in place (appending any
+    new ones) and swaps the result in atomically via os.replace.
+    
+    Args:
+        updates: Mapping of env var name to new value
+    """
+    out = []
+    replaced = set()
+    
+    if os.path.exists(ENV_PATH):
+        with open(ENV_PATH, 'r', encoding='utf-8') as source:
+            for mapping in parse_stream(source):
+                if mapping.key in updates:
+                    value = updates[mapping.key]
+                    out.append(f"{mapping.key}={_quote_env_value(value)}\n")
+                    replaced.add(mapping.key)
+                else:
+                    out.append(mapping.original.string)
+    
+    pending = {k: v for k, v in updates.items() if k not in replaced}
+    if pending and out and not out[-1].endswith('\n'):
+        out.append('\n')
+    for key, value in pending.items():
+        out.append(f"{key}={_quote_env_value(value)}\n")
+    
+    env_dir = os.path.dirname(os.path.abspath(ENV_PATH))
+    with tempfile.NamedTemporaryFile(
+        'w', encoding='utf-8', dir=env_dir, prefix='.tmp_', delete=False
+    ) as dest:
+        dest.writelines(out)
+    os.replace(dest.name, ENV_PATH)
+
+
+@lru_cache(maxsize=1)
+def _get_oauth_handler():
+    """OAuth handler for the configured app, built on first use"""
+    # Deferred so the server starts without loading the API client stack
+    from src.tiktok_real_api import TikTokOAuth
+    return TikTokOAuth(APP_ID, APP_SECRET, REDIRECT_URI)
+
+
+@app.route('/')
+def home():
+    """Home page with instructions"""
+    if not _CREDS_OK:
+        return _html(_CONFIG_MISSING_PAGE)
+    
+    return _html(_HOME_PAGE)
 
 
 @app.route('/start')
 def start():
     """Start OAuth flow"""
-    if not oauth_handler:
+    if not _CREDS_OK:
         return redirect('/')
     
-    auth_url = oauth_handler.get_authorization_url(oauth_state)
+    # Per-browser CSRF state, kept in the signed session cookie
+    state = secrets.token_urlsafe(32)
+    session['oauth_state'] = state
+    
+    auth_url = _get_oauth_handler().get_authorization_url(state)
     return redirect(auth_url)
 
 
@@ -94,55 +192,39 @@ def start():
 def callback():
     """Handle OAuth callback"""
     auth_code = request.args.get('auth_code')
-    state = request.args.get('state')
+    state = request.args.get('state') or ''
+    expected_state = session.pop('oauth_state', None)
     
     if not auth_code:
-        return '<h1>❌ No authorization code received</h1><a href="/">Try Again</a>'
+        return _html(_NO_CODE_PAGE)
     
-    if state != oauth_state:
-        return '<h1>❌ Invalid state - security error</h1><a href="/">Try Again</a>'
+    # Compare bytes: compare_digest rejects non-ASCII str, and state is user input
+    if not expected_state or not hmac.compare_digest(state.encode(), expected_state.encode()):
+        return _html(_INVALID_STATE_PAGE)
     
     # Exchange code for token
-    success, result = oauth_handler.exchange_code_for_token(auth_code)
+    success, result = _get_oauth_handler().exchange_code_for_token(auth_code)
     
     if success:
         access_token = result['access_token']
         advertiser_ids = result.get('advertiser_ids', [])
         advertiser_id = advertiser_ids[0] if advertiser_ids else ''
         
-        # Save to .env
-        set_key('.env', 'TIKTOK_ACCESS_TOKEN', access_token)
+        # Save to .env (single read + atomic rewrite)
+        updates = {'TIKTOK_ACCESS_TOKEN': access_token}
         if advertiser_id:
-            set_key('.env', 'TIKTOK_ADVERTISER_ID', advertiser_id)
-        set_key('.env', 'TIKTOK_MOCK_MODE', 'false')
+            updates['TIKTOK_ADVERTISER_ID'] = advertiser_id
+        updates['TIKTOK_MOCK_MODE'] = 'false'
+        _write_env_batch(updates)
         
-        return f'''
-        <html>
-        <body style="font-family: Arial; max-width: 800px; margin: 50px auto;">
-            <h1>🎉 OAuth Successful!</h1>
-            <div style="background: #e8f5e9; padding: 20px; border-radius: 5px;">
-                <h3>✅ Credentials Saved</h3>
-                <p>Access Token: <code>{access_token[:40]}...</code></p>
-                <p>Advertiser ID: <code>{advertiser_id}</code></p>
-            </div>
-            
-            <div style="background: #fff3cd; padding: 20px; border-radius: 5px; margin-top: 20px;">
-                <h3>🚀 Next Steps:</h3>
-                <ol>
-                    <li>Stop this server (Ctrl+C)</li>
-                    <li>Run: <code>python -m src.main</code></li>
-                    <li>Agent will use REAL TikTok API!</li>
-                </ol>
-            </div>
-        </body>
-        </html>
-        '''
+        page = _SUCCESS_TMPL.substitute(
+            token_prefix=access_token[:40],
+            advertiser_id=advertiser_id
+        )
+        return _html(page.encode('utf-8'))
     else:
-        return f'''
-        <h1>❌ Token Exchange Failed</h1>
-        <p>{result.get('message')}</p>
-        <a href="/">Try Again</a>
-        '''
+        page = _FAILURE_TMPL.substitute(message=result.get('message'))
+        return _html(page.encode('utf-8'))
 
 
 if __name__ == '__main__':
@@ -152,4 +234,13 @@ if __name__ == '__main__':
     print("\n📍 Open browser: http://localhost:8000")
     print("\n" + "="*60 + "\n")
     
-    app.run(host='localhost', port=8000, debug=False)
\ No newline at end of file
+    try:
+        # Production WSGI server when installed (pip install waitress)
+        from waitress import serve
+    except ImportError:
+        serve = None
+    
+    if serve is not None:
+        serve(app, host='localhost', port=8000, threads=4)
+    else:
+        app.run(host='localhost', port=8000, debug=False, threaded=True)
\ No newline at end of file
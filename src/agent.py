@@ -3,30 +3,76 @@ Core AI Agent - The Brain of the System
 Handles conversation flow, LLM calls, and orchestration
 """
 
-import json
+import copy
 import time
-from typing import Dict, Any, Optional, Tuple
-from google import genai
+from collections import OrderedDict
+from typing import Dict, Any, Callable, Optional, Tuple
+from pydantic import ValidationError
 
+from . import serialization
 from .config import settings
-from .state import AdCampaignState, ConversationStage, MusicChoice
+from .state import AdCampaignState, ConversationLog, ConversationStage, MusicChoice
 from .validators import (
     FieldValidator,
     MusicValidator,
     validate_complete_campaign,
     AdCampaignData
 )
-from .tiktok_api import TikTokAPI, APIResponse, interpret_api_error
-from .tiktok_auth import TikTokOAuth
+from .tiktok_api import APIResponse, interpret_api_error
 from .prompts import (
-    SYSTEM_PROMPT,
-    create_user_prompt,
+    SYSTEM_INSTRUCTION,
+    PromptBuilder,
     MUSIC_VALIDATION_PROMPT,
     FINAL_REVIEW_PROMPT,
     SUBMISSION_RESULT_PROMPT,
     ERROR_RECOVERY_PROMPT
 )
 
+# google-genai pulls in a heavy dependency tree; import it on first LLM use
+_genai = None
+
+
+def _load_genai():
+    """Import google.genai once and cache the module"""
+    global _genai
+    if _genai is None:
+        from google import genai
+        _genai = genai
+    return _genai
+
+
+class _ResponseCache:
+    """
+    Per-agent LRU of LLM replies
+    
+    Keyed on (user message, previous assistant message, campaign fields,
+    stage), so a short reply like "yes" only hits when it answers the same
+    question in the same state. Entries hold the prompt and raw reply text
+    so a hit can still be recorded in the chat session.
+    """
+    
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[tuple, Tuple[str, str, Dict[str, Any]]]" = OrderedDict()
+    
+    def get(self, key: tuple) -> Optional[Tuple[str, str, Dict[str, Any]]]:
+        """(prompt, reply text, copy of the parsed reply), or None"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        prompt, text, parsed = entry
+        return prompt, text, copy.deepcopy(parsed)
+    
+    def put(self, key: tuple, prompt: str, text: str, parsed: Dict[str, Any]):
+        """Store a reply, evicting the least recently used beyond maxsize"""
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = (prompt, text, copy.deepcopy(parsed))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
 
 class TikTokAdAgent:
     """
@@ -40,15 +86,28 @@ class TikTokAdAgent:
     - Handle errors gracefully
     """
     
+    # Campaign fields the LLM may fill in via its "data" object
+    _STATE_FIELDS = ("campaign_name", "objective", "ad_text", "cta", "music_id")
+    
+    # Earlier chat contents (user and model turns) sent with each request
+    _HISTORY_WINDOW = 6
+    
     def __init__(self):
         """Initialize agent with real or mock API based on configuration"""
     
-        # Initialize Gemini
-        self.client = genai.Client(api_key=settings.google_api_key)
+        # Gemini client and chat session are created lazily on the first LLM call
+        self._client = None
+        self._chat = None
         self.model_name = settings.gemini_model
     
         # Initialize state
-        self.state = AdCampaignState()
+        self.state = AdCampaignState.model_construct()
+        self.conversation = ConversationLog()
+        self._prompt_builder = PromptBuilder()
+        self._response_cache = _ResponseCache(settings.llm_response_cache_size)
+        
+        # (field values, validated payload) from finalization, reused on submit
+        self._finalized: Optional[Tuple[tuple, Dict[str, Any]]] = None
     
         # Initialize TikTok API (real or mock)
         if settings.tiktok_mock_mode:
@@ -81,31 +140,131 @@ class TikTokAdAgent:
         print(f"\n✅ Agent initialized")
         print(f"   Model: {self.model_name}")
         print(f"   Mode: {'MOCK' if settings.tiktok_mock_mode else 'REAL API'}\n")
+    
+    def reset(self):
+        """
+        Start a new campaign conversation
+        
+        Keeps the Gemini client and TikTok API connection so a restart
+        does not pay for client setup or the connection test again.
+        """
+        self.state = AdCampaignState.model_construct()
+        self.conversation = ConversationLog()
+        self._prompt_builder = PromptBuilder()
+        self._response_cache = _ResponseCache(settings.llm_response_cache_size)
+        self._chat = None
+        self._finalized = None
+    
+    @property
+    def client(self):
+        """Gemini client, built on first access"""
+        if self._client is None:
+            genai = _load_genai()
+            self._client = genai.Client(api_key=settings.google_api_key)
+        return self._client
+    
+    @property
+    def chat(self):
+        """
+        Gemini chat session for this conversation
+        
+        SYSTEM_INSTRUCTION is supplied once through the chat config. The
+        session resends its whole history with every message, so once that
+        history grows past _HISTORY_WINDOW contents the session is rebuilt,
+        seeded with only the most recent turns from the conversation log.
+        """
+        if (self._chat is not None
+                and len(self._chat.get_history(curated=True)) > self._HISTORY_WINDOW):
+            self._chat = None
+        if self._chat is None:
+            self._chat = self.client.chats.create(
+                model=self.model_name,
+                config={"system_instruction": SYSTEM_INSTRUCTION},
+                history=self._chat_history()
+            )
+        return self._chat
+    
+    def _chat_history(self) -> list[dict]:
+        """
+        Last _HISTORY_WINDOW exchanged messages as Gemini chat contents
+        
+        Seeds from the prompts and raw replies actually sent, so a rebuilt
+        session looks like the live one; turns that never reached the LLM
+        (or whose reply was unusable) are left out. The window always
+        starts on a user turn.
+        """
+        messages = [m for m in self.conversation if m["sent"] is not None]
+        messages = messages[-self._HISTORY_WINDOW:]
+        if messages and messages[0]["role"] != "user":
+            messages.pop(0)
+        return [
+            {
+                "role": "user" if m["role"] == "user" else "model",
+                "parts": [{"text": m["sent"]}]
+            }
+            for m in messages
+        ]
+    
+    def _record_cached_turn(self, prompt: str, response_text: str):
+        """
+        Add a turn answered from the response cache to the chat session
+        
+        Keeps the live session's history in step with the conversation
+        without another request. A session not created yet is seeded from
+        the conversation log instead.
+        """
+        if self._chat is None:
+            return
+        types = _load_genai().types
+        self._chat.record_history(
+            user_input=types.Content(role="user", parts=[types.Part(text=prompt)]),
+            model_output=[types.Content(role="model", parts=[types.Part(text=response_text)])],
+            is_valid=True
+        )
+    
     def _initialize_oauth(self):
         """Initialize OAuth authentication"""
         try:
             self.oauth.simulate_full_oauth_flow()
-            self.state.conversation_history.append({
-                "role": "system",
-                "content": "OAuth authentication successful"
-            })
+            self.conversation.append("system", "OAuth authentication successful")
         except Exception as e:
             print(f"⚠️ OAuth initialization warning: {e}")
             print("   Continuing in mock mode...")
     
-    def _call_llm(self, user_message: str) -> Dict[str, Any]:
+    def _call_llm(
+        self,
+        user_message: str,
+        on_chunk: Optional[Callable[[str], None]] = None
+    ) -> Tuple[Dict[str, Any], Optional[Tuple[str, str]]]:
         """
         Calls Gemini LLM with structured output
         
+        The response is streamed; JSON parsing runs on the assembled
+        buffer once the stream ends.
+        
         Args:
             user_message: User's input
+            on_chunk: Optional callback receiving each streamed text chunk
             
         Returns:
-            Parsed JSON response from LLM
+            (parsed JSON response, (prompt, raw reply text)); the second
+            item is None when no usable exchange took place
         """
+        cache_key = (
+            user_message.strip(),
+            self.conversation.last("assistant"),
+            self._campaign_fields(),
+            self.state.stage
+        )
+        cached = self._response_cache.get(cache_key)
+        if cached is not None:
+            prompt, response_text, parsed = cached
+            self._record_cached_turn(prompt, response_text)
+            return parsed, (prompt, response_text)
+        
         try:
             # Build prompt with context
-            prompt = create_user_prompt(
+            prompt = self._prompt_builder.build(
                 user_message=user_message,
                 current_data={
                     "campaign_name": self.state.campaign_name,
@@ -113,38 +272,33 @@ class TikTokAdAgent:
                     "ad_text": self.state.ad_text,
                     "cta": self.state.cta,
                     "music_id": self.state.music_id
-                },
-                conversation_history=self.state.conversation_history
+                }
             )
             
-            # Combine system prompt with user prompt
-            full_prompt = f"{SYSTEM_PROMPT}\n\nUser Task:\n{prompt}"
+            # Chat session already holds the system prompt and earlier turns
+            chunks = []
+            for chunk in self.chat.send_message_stream(prompt):
+                if chunk.text:
+                    chunks.append(chunk.text)
+                    if on_chunk:
+                        on_chunk(chunk.text)
             
-            # Call Gemini with new SDK syntax
-            response = self.client.models.generate_content(
-                model=self.model_name,
-                contents=full_prompt
+            # Parse JSON response, removing markdown code fences if present
+            response_text = (
+                "".join(chunks).strip()
+                .removeprefix("```json")
+                .removeprefix("```")
+                .removesuffix("```")
+                .strip()
             )
             
-            # Parse JSON response
-            response_text = response.text.strip()
-            
-            # Remove markdown code blocks if present
-            if response_text.startswith("```json"):
-                response_text = response_text[7:]
-            if response_text.startswith("```"):
-                response_text = response_text[3:]
-            if response_text.endswith("```"):
-                response_text = response_text[:-3]
-            
-            response_text = response_text.strip()
-            
             # Parse JSON
-            parsed = json.loads(response_text)
+            parsed = serialization.loads(response_text)
             
-            return parsed
+            self._response_cache.put(cache_key, prompt, response_text, parsed)
+            return parsed, (prompt, response_text)
             
-        except json.JSONDecodeError as e:
+        except serialization.JSONDecodeError as e:
             print(f"⚠️ Failed to parse LLM response as JSON: {e}")
             print(f"Raw response: {response_text[:200]}")
             
@@ -155,36 +309,41 @@ class TikTokAdAgent:
                 "data": {},
                 "validation_errors": ["LLM response parsing error"],
                 "next_step": "retry"
-            }
+            }, None
         
         except Exception as e:
             print(f"❌ Error calling LLM: {e}")
+            # A failed stream can leave the session mid-turn; start fresh
+            self._chat = None
             return {
                 "message": "I encountered an error. Let's try again.",
                 "action": "error",
                 "data": {},
                 "validation_errors": [str(e)],
                 "next_step": "retry"
-            }
+            }, None
     
-    def process_message(self, user_message: str) -> str:
+    def process_message(
+        self,
+        user_message: str,
+        on_chunk: Optional[Callable[[str], None]] = None
+    ) -> str:
         """
         Main entry point - processes user message and returns response
         
         Args:
             user_message: User's input message
+            on_chunk: Optional callback for streamed LLM output (progress UI)
             
         Returns:
             Agent's response message
         """
-        # Add to conversation history
-        self.state.conversation_history.append({
-            "role": "user",
-            "content": user_message
-        })
-        
         # Get LLM response
-        llm_response = self._call_llm(user_message)
+        llm_response, exchange = self._call_llm(user_message, on_chunk=on_chunk)
+        prompt, response_text = exchange or (None, None)
+        
+        # Add to conversation history, with what the LLM actually saw
+        self.conversation.append("user", user_message, sent=prompt)
         
         # Extract components
         message = llm_response.get("message", "")
@@ -203,25 +362,23 @@ class TikTokAdAgent:
             message = self._handle_submission()
         
         # Add assistant response to history
-        self.state.conversation_history.append({
-            "role": "assistant",
-            "content": message
-        })
+        self.conversation.append("assistant", message, sent=response_text)
         
         return message
     
     def _update_state_from_data(self, data: Dict[str, Any]):
         """Updates state with data from LLM response"""
-        if data.get("campaign_name"):
-            self.state.campaign_name = data["campaign_name"]
-        if data.get("objective"):
-            self.state.objective = data["objective"]
-        if data.get("ad_text"):
-            self.state.ad_text = data["ad_text"]
-        if data.get("cta"):
-            self.state.cta = data["cta"]
-        if data.get("music_id"):
-            self.state.music_id = data["music_id"]
+        changes = {}
+        for field in self._STATE_FIELDS:
+            value = data.get(field)
+            if value:
+                changes[field] = value
+        if changes:
+            self.state.unsafe_update(**changes)
+    
+    def _campaign_fields(self) -> tuple:
+        """Current campaign field values, in _STATE_FIELDS order"""
+        return tuple(getattr(self.state, field) for field in self._STATE_FIELDS)
     
     def _handle_music_validation(self) -> str:
         """
@@ -306,6 +463,18 @@ class TikTokAdAgent:
                 f"Please provide the missing information."
             )
         
+        # Full model validation happens once, here; submission relies on it
+        fields = self._campaign_fields()
+        try:
+            campaign = AdCampaignData(**dict(zip(self._STATE_FIELDS, fields)))
+        except ValidationError as e:
+            self._finalized = None
+            return f"❌ Validation error: {str(e)}"
+        
+        # The model strips name and text; submit its values, not raw state
+        self._finalized = (fields, campaign.model_dump())
+        self.state.stage = ConversationStage.FINALIZING
+        
         # Build final summary
         music_status = self.state.music_id if self.state.music_id else "No music"
         
@@ -335,22 +504,17 @@ Reply with:
     def _handle_submission(self) -> str:
         """Handles campaign submission to TikTok API"""
         
+        # Only submit what was validated and shown at finalization; if the
+        # fields changed since (or review was skipped), review them first
+        fields = self._campaign_fields()
+        if (self.state.stage != ConversationStage.FINALIZING
+                or self._finalized is None
+                or fields != self._finalized[0]):
+            return self._handle_finalization()
+        
         print("\n📤 Submitting campaign to TikTok Ads...")
         
-        # Create payload
-        try:
-            campaign = AdCampaignData(
-                campaign_name=self.state.campaign_name,
-                objective=self.state.objective,
-                ad_text=self.state.ad_text,
-                cta=self.state.cta,
-                music_id=self.state.music_id
-            )
-            
-            payload = campaign.dict()
-            
-        except Exception as e:
-            return f"❌ Validation error: {str(e)}"
+        payload = self._finalized[1]
         
         # Submit to API (different handling for real vs mock)
         if settings.tiktok_mock_mode:
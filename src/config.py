@@ -1,6 +1,7 @@
 """Configuration management"""
 
-from pydantic_settings import BaseSettings
+from functools import lru_cache
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import Literal
 
 
@@ -18,12 +19,26 @@ class Settings(BaseSettings):
     tiktok_advertiser_id: str = ""
     tiktok_mock_mode: bool = True  # Set to False when you have real credentials
     
+    # Exact-match LLM response cache, per agent conversation (0 disables);
+    # one entry per turn the conversation log holds (64 messages)
+    llm_response_cache_size: int = 32
+    
     # Application
     log_level: Literal["DEBUG", "INFO", "WARNING", "ERROR"] = "INFO"
     
-    class Config:
-        env_file = ".env"
-        case_sensitive = False
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        extra="ignore",
+        frozen=True  # settings are read-only after load; also makes them hashable
+    )
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Load settings once per process; later calls reuse the same instance"""
+    return Settings()
 
 
-settings = Settings()
\ No newline at end of file
+settings = get_settings()
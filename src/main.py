@@ -6,19 +6,15 @@ Beautiful command-line interface for the TikTok Ad Agent
 import sys
 from rich.console import Console
 from rich.panel import Panel
-from rich.markdown import Markdown
 from rich.prompt import Prompt
-from rich import print as rprint
+from rich.text import Text
 
 from .agent import TikTokAdAgent
 
 
 console = Console()
 
-
-def print_banner():
-    """Prints welcome banner"""
-    banner = """
+BANNER = Text("""
 ╔══════════════════════════════════════════════════════╗
 ║                                                      ║
 ║     🎯  TikTok AI Ad Campaign Creator  🎯           ║
@@ -27,8 +23,22 @@ def print_banner():
 ║     Created for SoluLab AI Internship Assignment             ║
 ║                                                      ║
 ╚══════════════════════════════════════════════════════╝
-"""
-    console.print(banner, style="bold cyan")
+""", style="bold cyan")
+
+
+def print_banner():
+    """Prints welcome banner"""
+    console.print(BANNER)
+
+
+def show_progress(text: str):
+    """Show a one-line status that the next output overwrites"""
+    console.print(f"[yellow]{text}", end="\r")
+
+
+def clear_progress():
+    """Blank out the status line left by show_progress"""
+    console.print(" " * 60, end="\r")
 
 
 def main():
@@ -38,8 +48,9 @@ def main():
     
     try:
         # Initialize agent
-        with console.status("[yellow]Initializing AI agent...", spinner="dots"):
-            agent = TikTokAdAgent()
+        show_progress("Initializing AI agent...")
+        agent = TikTokAdAgent()
+        clear_progress()
         
         # Print greeting iouoi
         greeting = agent.get_greeting()
@@ -69,7 +80,7 @@ def main():
                     continue
                 
                 if user_input.lower() == 'restart':
-                    agent = TikTokAdAgent()
+                    agent.reset()
                     greeting = agent.get_greeting()
                     console.print(Panel(greeting, title="[bold green]Agent[/bold green]", border_style="green"))
                     continue
@@ -94,16 +105,25 @@ def main():
                 if user_input.lower().startswith('upload '):
                     file_name = user_input[7:].strip()
                     if file_name:
-                        with console.status("[yellow]Uploading music...", spinner="dots"):
-                            response = agent.handle_music_upload(file_name)
+                        show_progress("Uploading music...")
+                        response = agent.handle_music_upload(file_name)
+                        clear_progress()
                         console.print(Panel(response, title="[bold green]Agent[/bold green]", border_style="green"))
                     else:
                         console.print("[red]Please specify a file name: upload filename.mp3[/red]")
                     continue
                 
-                # Process message with agent
-                with console.status("[yellow]Thinking...", spinner="dots"):
-                    response = agent.process_message(user_input)
+                # Process message with agent, showing progress as the reply streams in
+                show_progress("Thinking...")
+                received = 0
+                
+                def on_chunk(text: str):
+                    nonlocal received
+                    received += len(text)
+                    show_progress(f"Receiving response... ({received} chars)")
+                
+                response = agent.process_message(user_input, on_chunk=on_chunk)
+                clear_progress()
                 
                 # Display response
                 console.print(Panel(response, title="[bold green]Agent[/bold green]", border_style="green"))
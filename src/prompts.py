@@ -3,7 +3,9 @@ Prompt templates for Gemini LLM
 Optimized for structured output and conversational flow
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+
+from .state import missing_fields
 
 # System prompt for the AI agent
 SYSTEM_PROMPT = """You are a professional TikTok Ads Campaign Assistant. Your role is to help users create ad campaigns through natural, friendly conversation.
@@ -63,97 +65,98 @@ IMPORTANT:
 - The JSON must be valid and parseable
 """
 
+# Standing task instructions; identical every turn, so they belong with
+# the system prompt rather than in each (history-kept) user turn
+TASK_INSTRUCTIONS = """
+TASK:
+Based on the conversation and current state, determine:
+1. How to respond to the user's message
+2. Whether to validate their input
+3. What to ask for next (if anything)
+4. Whether we're ready to finalize and submit
 
-def create_user_prompt(
-    user_message: str,
-    current_data: Dict[str, Any],
-    conversation_history: list,
-    last_action: str = None
-) -> str:
-    """
-    Creates the user prompt with context
-    
-    Args:
-        user_message: Latest message from user
-        current_data: Currently collected campaign data
-        conversation_history: Previous messages
-        last_action: Last action taken by agent
-        
-    Returns:
-        Formatted prompt string
-    """
-    
-    # Build conversation context
-    history_text = ""
-    if conversation_history:
-        recent_history = conversation_history[-6:]  # Last 3 exchanges
-        for msg in recent_history:
-            role = msg.get("role", "unknown")
-            content = msg.get("content", "")
-            if role == "user":
-                history_text += f"User: {content}\n"
-            elif role == "assistant":
-                history_text += f"Assistant: {content}\n"
+Remember: 
+- Validate input immediately
+- Be friendly and encouraging
+- If they gave invalid input, explain why and ask again
+- Follow the business rules strictly
+- Respond ONLY with the JSON structure defined above
+"""
+
+# Full system instruction for the chat session: the fixed prefix of every request
+SYSTEM_INSTRUCTION = f"{SYSTEM_PROMPT}\n{TASK_INSTRUCTIONS}"
+
+
+def _format_state(current_data: Dict[str, Any]) -> str:
+    """Render the collected-data summary and the still-needed line"""
     
     # Build current state summary
-    state_text = "Current collected data:\n"
+    lines = ["Current collected data:\n"]
     for field, value in current_data.items():
         if value:
-            state_text += f"  ✓ {field}: {value}\n"
+            lines.append(f"  ✓ {field}: {value}\n")
         else:
-            state_text += f"  ○ {field}: (not collected yet)\n"
+            lines.append(f"  ○ {field}: (not collected yet)\n")
+    state_text = "".join(lines)
     
     # Determine what's needed next
-    needed = []
-    if not current_data.get("campaign_name"):
-        needed.append("campaign name")
-    if not current_data.get("objective"):
-        needed.append("objective")
-    if not current_data.get("ad_text"):
-        needed.append("ad text")
-    if not current_data.get("cta"):
-        needed.append("CTA")
+    needed = list(missing_fields(current_data))
     
-    # Special handling for music based on objective
-    objective = current_data.get("objective")
-    music_id = current_data.get("music_id")
-    
-    if objective == "Conversions" and not music_id:
-        needed.append("music (REQUIRED for Conversions)")
-    elif objective == "Traffic" and not music_id:
+    # Music is optional for Traffic, but still worth asking about
+    if current_data.get("objective") == "Traffic" and not current_data.get("music_id"):
         needed.append("music (optional for Traffic)")
     
     needed_text = "Still needed: " + ", ".join(needed) if needed else "All required fields collected!"
     
-    prompt = f"""
-CONVERSATION HISTORY:
-{history_text if history_text else "(Starting new conversation)"}
+    return f"{state_text}\n\n{needed_text}"
 
-{state_text}
 
-{needed_text}
+def _assemble_prompt(user_message: str, state_section: str) -> str:
+    """Join the per-turn prompt pieces: collected state, then the message"""
+    return f"""{state_section}
 
 USER'S LATEST MESSAGE:
 "{user_message}"
 
-TASK:
-Based on the conversation and current state, determine:
-1. How to respond to the user's message
-2. Whether to validate their input
-3. What to ask for next (if anything)
-4. Whether we're ready to finalize and submit
-
-Remember: 
-- Validate input immediately
-- Be friendly and encouraging
-- If they gave invalid input, explain why and ask again
-- Follow the business rules strictly
-- Respond ONLY with the JSON structure defined in your system prompt
-
 Your JSON response:
 """
+
+
+class PromptBuilder:
+    """
+    Builds the per-turn user prompt for a single conversation
+    
+    Conversation history lives in the Gemini chat session, so the prompt
+    only carries the collected data and the new message. The state
+    section is re-rendered only when the collected data changes.
+    """
     
-    return prompt
+    def __init__(self):
+        self._state_items: Optional[tuple] = None
+        self._state_text = ""
+    
+    def build(self, user_message: str, current_data: Dict[str, Any]) -> str:
+        """
+        Creates the user prompt with context
+        
+        Args:
+            user_message: Latest message from user
+            current_data: Currently collected campaign data
+            
+        Returns:
+            Formatted prompt string
+        """
+        items = tuple(current_data.items())
+        if items != self._state_items:
+            self._state_text = _format_state(current_data)
+            self._state_items = items
+        
+        return _assemble_prompt(user_message, self._state_text)
+
+
+def create_user_prompt(user_message: str, current_data: Dict[str, Any]) -> str:
+    """One-off user prompt, for callers without a PromptBuilder of their own"""
+    return PromptBuilder().build(user_message, current_data)
 
 
 # Specialized prompts for specific scenarios
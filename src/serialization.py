@@ -0,0 +1,35 @@
+"""
+JSON encode/decode helpers
+Uses orjson when installed, stdlib json otherwise
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; stdlib json is the fallback
+    orjson = None
+
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can
+# catch this one type whichever backend is active
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data):
+    """
+    Parse JSON from str or bytes
+    
+    Raises:
+        JSONDecodeError: If data is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj) -> bytes:
+    """Serialize obj to compact UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
@@ -3,11 +3,41 @@ Conversation state management
 Single source of truth for ad campaign data
 """
 
-from pydantic import BaseModel, Field
-from typing import Optional, Literal
+from collections import deque
+from itertools import islice
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Any, Deque, Mapping, Optional, Literal
 from enum import Enum
 
 
+# Number of messages kept by ConversationLog; older ones are dropped
+HISTORY_MAXLEN = 64
+
+# Fields every campaign needs, with the label used when asking for them
+REQUIRED_FIELDS = (
+    ("campaign_name", "campaign name"),
+    ("objective", "objective"),
+    ("ad_text", "ad text"),
+    ("cta", "CTA"),
+)
+
+# Label used when a Conversions campaign has no music yet
+MUSIC_REQUIRED_LABEL = "music (REQUIRED for Conversions)"
+
+
+def missing_fields(data: Mapping[str, Any]) -> tuple[str, ...]:
+    """
+    Labels of the required fields still missing from `data`
+    
+    Single home for the business rules: every REQUIRED_FIELDS entry must
+    be set, and Conversions campaigns must also have a music ID.
+    """
+    missing = [label for field, label in REQUIRED_FIELDS if not data.get(field)]
+    if data.get("objective") == "Conversions" and not data.get("music_id"):
+        missing.append(MUSIC_REQUIRED_LABEL)
+    return tuple(missing)
+
+
 class ConversationStage(str, Enum):
     """Tracks where we are in the conversation"""
     GREETING = "greeting"
@@ -31,15 +61,60 @@ class MusicChoice(str, Enum):
     NOT_DECIDED = "not_decided"
 
 
+class ConversationLog:
+    """
+    Bounded, append-only message history
+    
+    Kept outside AdCampaignState so the pydantic model never has to
+    validate or copy a growing list of messages.
+    """
+    
+    def __init__(self, maxlen: int = HISTORY_MAXLEN):
+        self._messages: Deque[dict] = deque(maxlen=maxlen)
+    
+    def append(self, role: str, content: str, sent: Optional[str] = None):
+        """
+        Record one message
+        
+        `sent` is the text actually exchanged with the LLM for this
+        message (the full prompt, or the raw reply), when there was one.
+        """
+        self._messages.append({"role": role, "content": content, "sent": sent})
+    
+    def recent(self, count: int) -> list[dict]:
+        """The last `count` messages, oldest first"""
+        start = max(0, len(self._messages) - count)
+        return list(islice(self._messages, start, None))
+    
+    def last(self, role: str) -> Optional[str]:
+        """Content of the most recent message from `role`, if any"""
+        for message in reversed(self._messages):
+            if message["role"] == role:
+                return message["content"]
+        return None
+    
+    def __iter__(self):
+        return iter(self._messages)
+    
+    def __len__(self) -> int:
+        return len(self._messages)
+
+
 class AdCampaignState(BaseModel):
     """
     Central state object for the entire conversation
     All validations happen here
     """
     
-    # Conversation management
+    # The agent owns one state object and mutates it in place; never
+    # re-validate or copy it when it is passed on
+    model_config = ConfigDict(
+        revalidate_instances="never",
+        validate_assignment=False
+    )
+    
+    # Conversation management (message history lives in ConversationLog)
     stage: ConversationStage = ConversationStage.GREETING
-    conversation_history: list[dict] = Field(default_factory=list)
     
     # Campaign data
     campaign_name: Optional[str] = None
@@ -55,16 +130,23 @@ class AdCampaignState(BaseModel):
     validation_errors: list[str] = Field(default_factory=list)
     last_api_error: Optional[str] = None
     
+    def unsafe_update(self, **changes):
+        """
+        Set fields without running pydantic validation
+        
+        Only for values from our own already-validated code paths;
+        anything user-supplied should go through model_validate.
+        """
+        self.__dict__.update(changes)
+        self.__pydantic_fields_set__.update(changes)
+    
+    def missing_fields(self) -> tuple[str, ...]:
+        """Labels of the required fields not collected yet"""
+        return missing_fields(self.model_dump())
+    
     def is_ready_for_submission(self) -> bool:
         """Check if all required fields are collected and valid"""
-        if not all([self.campaign_name, self.objective, self.ad_text, self.cta]):
-            return False
-        
-        # Music validation based on objective
-        if self.objective == "Conversions" and not self.music_id:
-            return False
-        
-        return True
+        return not self.missing_fields()
     
     def to_payload(self) -> dict:
         """Convert to TikTok API payload format"""
@@ -76,4 +158,4 @@ class AdCampaignState(BaseModel):
                 "cta": self.cta,
                 "music_id": self.music_id
             }
-        }
\ No newline at end of file
+        }
@@ -14,15 +14,17 @@ This mock maintains the same structure and error handling
 patterns as the real API would require.
 """
 
+import asyncio
 import random
 import time
+from functools import lru_cache
 from typing import Dict, Optional, Tuple, Literal
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class APIResponse:
-    """Standard API response structure"""
+    """Standard API response structure (immutable, so instances can be shared)"""
     success: bool
     data: Optional[Dict] = None
     error_code: Optional[str] = None
@@ -82,15 +84,34 @@ class TikTokAPI:
         }
     }
     
-    def __init__(self, mock_mode: bool = True):
+    # Ready-made failure responses for the canned scenarios
+    ERROR_RESPONSES = {
+        error_type: APIResponse(
+            success=False,
+            error_code=error_type,
+            error_message=info["message"],
+            suggestion=info["suggestion"]
+        )
+        for error_type, info in ERROR_SCENARIOS.items()
+    }
+    
+    def __init__(self, mock_mode: bool = True, seed: Optional[int] = None):
         self.mock_mode = mock_mode
+        # Private RNG per client: sessions don't share the global random
+        # state, and a seed makes the simulated outcomes reproducible
+        self._rng = random.Random(seed)
         self.request_count = 0
         self.last_request_time = 0
     
     def _simulate_network_delay(self):
         """Simulate API network latency"""
         if self.mock_mode:
-            time.sleep(random.uniform(0.3, 0.8))  # 300-800ms delay
+            time.sleep(self._rng.uniform(0.3, 0.8))  # 300-800ms delay
+    
+    async def _simulate_network_delay_async(self):
+        """Simulate API network latency without blocking the event loop"""
+        if self.mock_mode:
+            await asyncio.sleep(self._rng.uniform(0.3, 0.8))
     
     def _check_rate_limit(self):
         """Simulate rate limiting"""
@@ -127,12 +148,23 @@ class TikTokAPI:
         print(f"🔍 Validating Music ID: {music_id}")
         
         self._simulate_network_delay()
+        return self._validate_music(music_id)
+    
+    async def validate_music_async(self, music_id: str) -> APIResponse:
+        """Async validate_music; awaits the simulated latency instead of blocking"""
+        print(f"🔍 Validating Music ID: {music_id}")
+        
+        await self._simulate_network_delay_async()
+        return self._validate_music(music_id)
+    
+    def _validate_music(self, music_id: str) -> APIResponse:
+        """Shared body of validate_music / validate_music_async, run after the delay"""
         self._check_rate_limit()
         
         # Case 1: Valid music ID (80% chance if in database)
         if music_id in self.VALID_MUSIC_IDS:
             # 80% success, 20% random failure for testing
-            if random.random() < 0.8:
+            if self._rng.random() < 0.8:
                 music_data = self.VALID_MUSIC_IDS[music_id]
                 return APIResponse(
                     success=True,
@@ -146,14 +178,8 @@ class TikTokAPI:
                 )
             else:
                 # Random failure scenario
-                error_type = random.choice(["copyright_claim", "geo_restricted"])
-                error_info = self.ERROR_SCENARIOS[error_type]
-                return APIResponse(
-                    success=False,
-                    error_code=error_type,
-                    error_message=error_info["message"],
-                    suggestion=error_info["suggestion"]
-                )
+                error_type = self._rng.choice(["copyright_claim", "geo_restricted"])
+                return self.ERROR_RESPONSES[error_type]
         
         # Case 2: Invalid music ID
         else:
@@ -179,12 +205,23 @@ class TikTokAPI:
         print(f"📤 Uploading custom music: {file_name}")
         
         self._simulate_network_delay()
+        return self._simulate_music_upload(file_name)
+    
+    async def simulate_music_upload_async(self, file_name: str) -> APIResponse:
+        """Async simulate_music_upload; awaits the simulated latency instead of blocking"""
+        print(f"📤 Uploading custom music: {file_name}")
+        
+        await self._simulate_network_delay_async()
+        return self._simulate_music_upload(file_name)
+    
+    def _simulate_music_upload(self, file_name: str) -> APIResponse:
+        """Shared body of simulate_music_upload / simulate_music_upload_async, run after the delay"""
         self._check_rate_limit()
         
         # 90% success rate for uploads
-        if random.random() < 0.9:
+        if self._rng.random() < 0.9:
             # Generate mock music ID
-            mock_music_id = f"MUS_CUSTOM_{random.randint(10000, 99999)}"
+            mock_music_id = f"MUS_CUSTOM_{self._rng.randint(10000, 99999)}"
             
             return APIResponse(
                 success=True,
@@ -197,14 +234,8 @@ class TikTokAPI:
             )
         else:
             # Simulate upload failure
-            error_type = random.choice(["duration_invalid", "copyright_claim"])
-            error_info = self.ERROR_SCENARIOS[error_type]
-            return APIResponse(
-                success=False,
-                error_code=error_type,
-                error_message=error_info["message"],
-                suggestion=error_info["suggestion"]
-            )
+            error_type = self._rng.choice(["duration_invalid", "copyright_claim"])
+            return self.ERROR_RESPONSES[error_type]
     
     def submit_campaign(self, campaign_data: Dict) -> APIResponse:
         """
@@ -219,11 +250,22 @@ class TikTokAPI:
         print(f"📤 Submitting campaign: {campaign_data.get('campaign_name')}")
         
         self._simulate_network_delay()
+        return self._submit_campaign(campaign_data)
+    
+    async def submit_campaign_async(self, campaign_data: Dict) -> APIResponse:
+        """Async submit_campaign; awaits the simulated latency instead of blocking"""
+        print(f"📤 Submitting campaign: {campaign_data.get('campaign_name')}")
+        
+        await self._simulate_network_delay_async()
+        return self._submit_campaign(campaign_data)
+    
+    def _submit_campaign(self, campaign_data: Dict) -> APIResponse:
+        """Shared body of submit_campaign / submit_campaign_async, run after the delay"""
         self._check_rate_limit()
         
         # 95% success rate for well-formed campaigns
-        if random.random() < 0.95:
-            campaign_id = f"CAMP_{random.randint(100000, 999999)}"
+        if self._rng.random() < 0.95:
+            campaign_id = f"CAMP_{self._rng.randint(100000, 999999)}"
             
             return APIResponse(
                 success=True,
@@ -246,6 +288,43 @@ class TikTokAPI:
             )
 
 
+# Explanation per error code; {suggestion} is filled from the response
+_ERROR_TEMPLATES = {
+    "invalid_music_id": (
+        "🎵 The Music ID you provided doesn't exist in TikTok's library.\n\n"
+        "This could mean:\n"
+        "  • The ID was typed incorrectly\n"
+        "  • The music was removed from TikTok's library\n"
+        "  • The ID is from a different platform\n\n"
+        "💡 {suggestion}"
+    ),
+    "copyright_claim": (
+        "⚠️ Copyright Issue Detected\n\n"
+        "This music has copyright restrictions and cannot be used in advertisements.\n"
+        "Using copyrighted music without permission can result in your ad being rejected.\n\n"
+        "💡 {suggestion}"
+    ),
+    "geo_restricted": (
+        "🌍 Geographic Restriction\n\n"
+        "This music is not available in all regions where you're targeting your ads.\n"
+        "TikTok requires music to be licensed in all target markets.\n\n"
+        "💡 {suggestion}"
+    ),
+    "duration_invalid": (
+        "⏱️ Music Duration Issue\n\n"
+        "TikTok ads have a maximum music duration of 60 seconds.\n"
+        "Longer tracks may cause playback issues.\n\n"
+        "💡 {suggestion}"
+    ),
+    "rate_limit_exceeded": (
+        "⏸️ Too Many Requests\n\n"
+        "You've exceeded the API rate limit.\n"
+        "This is a temporary restriction to prevent system overload.\n\n"
+        "💡 {suggestion}"
+    )
+}
+
+
 def interpret_api_error(response: APIResponse) -> str:
     """
     Interprets API errors and provides user-friendly explanations
@@ -262,44 +341,18 @@ def interpret_api_error(response: APIResponse) -> str:
     if response.success:
         return "✅ Success - no errors"
     
-    error_explanations = {
-        "invalid_music_id": (
-            "🎵 The Music ID you provided doesn't exist in TikTok's library.\n\n"
-            "This could mean:\n"
-            "  • The ID was typed incorrectly\n"
-            "  • The music was removed from TikTok's library\n"
-            "  • The ID is from a different platform\n\n"
-            f"💡 {response.suggestion}"
-        ),
-        "copyright_claim": (
-            "⚠️ Copyright Issue Detected\n\n"
-            "This music has copyright restrictions and cannot be used in advertisements.\n"
-            "Using copyrighted music without permission can result in your ad being rejected.\n\n"
-            f"💡 {response.suggestion}"
-        ),
-        "geo_restricted": (
-            "🌍 Geographic Restriction\n\n"
-            "This music is not available in all regions where you're targeting your ads.\n"
-            "TikTok requires music to be licensed in all target markets.\n\n"
-            f"💡 {response.suggestion}"
-        ),
-        "duration_invalid": (
-            "⏱️ Music Duration Issue\n\n"
-            "TikTok ads have a maximum music duration of 60 seconds.\n"
-            "Longer tracks may cause playback issues.\n\n"
-            f"💡 {response.suggestion}"
-        ),
-        "rate_limit_exceeded": (
-            "⏸️ Too Many Requests\n\n"
-            "You've exceeded the API rate limit.\n"
-            "This is a temporary restriction to prevent system overload.\n\n"
-            f"💡 {response.suggestion}"
-        )
-    }
-    
-    explanation = error_explanations.get(
-        response.error_code,
-        f"❌ Error: {response.error_message}\n\n💡 {response.suggestion}"
-    )
+    return _explain_error(response.error_code, response.error_message, response.suggestion)
+
+
+@lru_cache(maxsize=32)
+def _explain_error(
+    error_code: Optional[str],
+    error_message: Optional[str],
+    suggestion: Optional[str]
+) -> str:
+    """Render the explanation for one error; repeats return the cached string"""
+    template = _ERROR_TEMPLATES.get(error_code)
+    if template is None:
+        return f"❌ Error: {error_message}\n\n💡 {suggestion}"
     
-    return explanation
\ No newline at end of file
+    return template.format(suggestion=suggestion)
\ No newline at end of file
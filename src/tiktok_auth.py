@@ -15,14 +15,38 @@ For demonstration purposes, we mock this flow while maintaining
 the correct architectural pattern.
 """
 
+import base64
+import math
 import secrets
+import threading
 import time
 from typing import Optional, Dict
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from urllib.parse import quote, urlencode
 
 
-@dataclass
+# Mock tokens are drawn from one pre-read block of OS randomness instead of
+# a urandom call per token; refilled when exhausted
+_ENTROPY_POOL_SIZE = 4096
+_entropy = b""
+_entropy_offset = 0
+_entropy_lock = threading.Lock()
+
+
+def _mock_token_urlsafe(nbytes: int = 32) -> str:
+    """Equivalent of secrets.token_urlsafe(nbytes) backed by the entropy pool"""
+    global _entropy, _entropy_offset
+    with _entropy_lock:
+        if _entropy_offset + nbytes > len(_entropy):
+            _entropy = secrets.token_bytes(max(_ENTROPY_POOL_SIZE, nbytes))
+            _entropy_offset = 0
+        chunk = _entropy[_entropy_offset:_entropy_offset + nbytes]
+        _entropy_offset += nbytes
+    return base64.urlsafe_b64encode(chunk).rstrip(b"=").decode("ascii")
+
+
+@dataclass(slots=True)
 class OAuthToken:
     """OAuth access token with metadata"""
     access_token: str
@@ -30,20 +54,22 @@ class OAuthToken:
     expires_in: int = 3600  # 1 hour
     scope: str = "ads:read,ads:write"
     created_at: float = None
+    # Expiry deadline on the monotonic clock, immune to wall-clock changes
+    _expires_at_mono: float = field(default=0.0, init=False, repr=False)
     
     def __post_init__(self):
         if self.created_at is None:
             self.created_at = time.time()
+        age = time.time() - self.created_at
+        self._expires_at_mono = time.monotonic() + self.expires_in - age
     
     def is_expired(self) -> bool:
         """Check if token has expired"""
-        age = time.time() - self.created_at
-        return age >= self.expires_in
+        return time.monotonic() >= self._expires_at_mono
     
     def time_until_expiry(self) -> int:
         """Get seconds until token expires"""
-        age = time.time() - self.created_at
-        return max(0, self.expires_in - int(age))
+        return max(0, math.ceil(self._expires_at_mono - time.monotonic()))
 
 
 class TikTokOAuth:
@@ -68,7 +94,7 @@ class TikTokOAuth:
     
     def __init__(self):
         self.current_token: Optional[OAuthToken] = None
-        self.auth_state = secrets.token_urlsafe(32)
+        self.auth_state = _mock_token_urlsafe(32)
     
     def generate_auth_url(self) -> str:
         """
@@ -86,8 +112,7 @@ class TikTokOAuth:
             "scope": "ads:read,ads:write"
         }
         
-        param_string = "&".join(f"{k}={v}" for k, v in params.items())
-        auth_url = f"{self.AUTH_URL}?{param_string}"
+        auth_url = f"{self.AUTH_URL}?{urlencode(params, quote_via=quote)}"
         
         return auth_url
     
@@ -101,7 +126,7 @@ class TikTokOAuth:
             Authorization code
         """
         # Generate mock authorization code
-        auth_code = f"AUTH_{secrets.token_urlsafe(32)}"
+        auth_code = f"AUTH_{_mock_token_urlsafe(32)}"
         return auth_code
     
     def exchange_code_for_token(self, auth_code: str) -> OAuthToken:
@@ -135,7 +160,7 @@ class TikTokOAuth:
         # )
         
         # Generate mock access token
-        access_token = f"TT_ACCESS_{secrets.token_urlsafe(48)}"
+        access_token = f"TT_ACCESS_{_mock_token_urlsafe(48)}"
         
         token = OAuthToken(
             access_token=access_token,
@@ -3,16 +3,70 @@ Real TikTok Marketing API Integration
 Optimized for production with proper OAuth and error handling
 """
 
+import asyncio
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
 import logging
-from typing import Dict, Optional, Tuple
+import random
+import secrets
+import threading
+from email.utils import parsedate_to_datetime
+from types import MappingProxyType
+from urllib.parse import urlencode
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
+from . import serialization
+
 logger = logging.getLogger(__name__)
 
+# Map our objective to TikTok's objective types
+_OBJECTIVE_MAPPING = MappingProxyType({
+    "Traffic": "TRAFFIC",
+    "Conversions": "CONVERSIONS"
+})
+
+# Fields every /campaign/create/ request sends unchanged
+_CAMPAIGN_PAYLOAD_BASE = MappingProxyType({
+    "budget_mode": "BUDGET_MODE_INFINITE",
+    "operation_status": "ENABLE"
+})
+
+# Common TikTok API error codes
+_ERROR_MAPPINGS = MappingProxyType({
+    40001: {
+        'type': 'authentication_failed',
+        'message': 'Invalid or expired access token',
+        'suggestion': 'Re-authenticate using OAuth flow'
+    },
+    40002: {
+        'type': 'invalid_advertiser',
+        'message': 'Invalid advertiser ID',
+        'suggestion': 'Verify advertiser_id in configuration'
+    },
+    40100: {
+        'type': 'validation_error',
+        'message': 'Request validation failed',
+        'suggestion': 'Check all required fields are provided'
+    },
+    50000: {
+        'type': 'server_error',
+        'message': 'TikTok server error',
+        'suggestion': 'Retry after a few minutes'
+    }
+})
+
+_TIMEOUT_ERROR = {
+    'error': 'timeout',
+    'message': 'Request timed out. Please try again.',
+    'suggestion': 'Check your internet connection and retry.'
+}
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class TikTokConfig:
     """TikTok API Configuration"""
     app_id: str
@@ -21,6 +75,120 @@ class TikTokConfig:
     advertiser_id: str
 
 
+def _parse_json(response) -> Optional[Dict]:
+    """
+    Decode a TikTok JSON response body
+    
+    Returns None for 429/5xx responses, whose bodies are often HTML
+    error pages, and for bodies that are not valid JSON.
+    """
+    if response.status_code == 429 or response.status_code >= 500:
+        return None
+    try:
+        return serialization.loads(response.content)
+    except ValueError:
+        return None
+
+
+def _http_error(response) -> Dict:
+    """Error dict for a response _parse_json could not use"""
+    if response.status_code == 429:
+        return {
+            'error': 'rate_limited',
+            'message': 'TikTok API rate limit reached',
+            'suggestion': 'Wait a moment and retry.'
+        }
+    if response.status_code >= 500:
+        return {
+            'error': 'server_error',
+            'message': f'TikTok server error (HTTP {response.status_code})',
+            'suggestion': 'Retry after a few minutes'
+        }
+    return {
+        'error': 'bad_response',
+        'message': f'Unexpected response from TikTok API (HTTP {response.status_code})',
+        'suggestion': 'Check logs for details.'
+    }
+
+
+def _create_shared_adapter() -> HTTPAdapter:
+    """
+    Create the connection pool shared by every client in the process
+    
+    The pool keeps connections to business-api.tiktok.com alive, so
+    only the first call pays for the TLS handshake. Rate limits (429)
+    and 5xx responses are retried inside the adapter with exponential
+    backoff, honouring Retry-After. POST is not retried here:
+    create_campaign retries itself, with an idempotency key.
+    
+    Returns:
+        Configured transport adapter
+    """
+    retry = Retry(
+        total=5,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        respect_retry_after_header=True,
+        allowed_methods=["GET"],
+        # Hand the last response back so its error body can be reported
+        raise_on_status=False
+    )
+    return HTTPAdapter(pool_connections=16, pool_maxsize=128, max_retries=retry)
+
+
+_SHARED_ADAPTER = _create_shared_adapter()
+
+
+def _create_session() -> requests.Session:
+    """
+    Session for one client, mounted on the shared connection pool
+    
+    Each client gets its own Session, so cookies and other session
+    state never cross between tenants; only the pooled connections are
+    shared. Closing one of these sessions would close the shared pool,
+    so they are left open for the life of the process.
+    """
+    session = requests.Session()
+    session.mount('https://', _SHARED_ADAPTER)
+    return session
+
+
+_JSON_HEADERS = MappingProxyType({'Content-Type': 'application/json'})
+
+
+class _RateLimiter:
+    """
+    Token bucket pacing outbound API calls
+    
+    Waiting locally for a token is cheaper than having TikTok reject a
+    burst with 429s and retrying.
+    """
+    
+    def __init__(self, rate: float, capacity: int):
+        self.refill_rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.last = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """
+        Take a token, sleeping until it has refilled if the bucket is empty
+        
+        The token is reserved up front (the balance may go negative), so
+        the wait is computed once and slept outside the lock, and
+        concurrent callers queue behind each other's reservations.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.refill_rate)
+            self.last = now
+            self.tokens -= 1
+            wait = -self.tokens / self.refill_rate if self.tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+
+
 class TikTokRealAPI:
     """
     Real TikTok Marketing API Client
@@ -38,6 +206,19 @@ class TikTokRealAPI:
     AUTH_URL = "https://business-api.tiktok.com/portal/auth"
     TOKEN_URL = "https://business-api.tiktok.com/open_api/v1.3/oauth2/access_token/"
     
+    # Client-side pacing: sustained requests per second and burst size
+    RATE_LIMIT_QPS = 10
+    RATE_LIMIT_BURST = 20
+    
+    # Seconds a test_connection result is reused (health checks poll it)
+    CONNECTION_CHECK_TTL = 30.0
+    
+    # create_campaign retries for 429/5xx: attempts and full-jitter backoff
+    MAX_RETRIES = 3
+    RETRY_BASE_DELAY = 0.5
+    RETRY_MAX_DELAY = 8.0
+    RETRYABLE_CODES = (50000,)
+    
     def __init__(self, config: TikTokConfig):
         """
         Initialize TikTok API client
@@ -46,46 +227,64 @@ class TikTokRealAPI:
             config: TikTok API configuration with credentials
         """
         self.config = config
-        self.session = self._create_session()
-        logger.info("TikTok Real API initialized")
-    
-    def _create_session(self) -> requests.Session:
-        """
-        Create HTTP session with proper headers
-        
-        Returns:
-            Configured requests session
-        """
-        session = requests.Session()
-        session.headers.update({
+        self.session = _create_session()
+        self._headers = {
             'Access-Token': self.config.access_token,
             'Content-Type': 'application/json'
-        })
-        return session
+        }
+        # advertiser/info expects a JSON array string, e.g. ["123"]
+        self._advertiser_ids_param = serialization.dumps([self.config.advertiser_id]).decode()
+        self._limiter = _RateLimiter(self.RATE_LIMIT_QPS, self.RATE_LIMIT_BURST)
+        # (monotonic time, result) of the last successful test_connection probe
+        self._connection_check: Optional[Tuple[float, Tuple[bool, str]]] = None
+        self._connection_check_lock = threading.Lock()
+        logger.info("TikTok Real API initialized")
     
     def test_connection(self) -> Tuple[bool, str]:
         """
         Test API connection and credentials
         
+        A successful result is reused for CONNECTION_CHECK_TTL seconds;
+        failures are never cached, so the next call probes again.
+        Concurrent callers wait for one in-flight probe instead of each
+        sending their own.
+        
         Returns:
             (success, message) tuple
         """
+        with self._connection_check_lock:
+            now = time.monotonic()
+            if self._connection_check and now - self._connection_check[0] < self.CONNECTION_CHECK_TTL:
+                return self._connection_check[1]
+            
+            result = self._probe_connection()
+            self._connection_check = (time.monotonic(), result) if result[0] else None
+            return result
+    
+    def _probe_connection(self) -> Tuple[bool, str]:
+        """Call the advertiser info endpoint once; see test_connection"""
         endpoint = f"{self.BASE_URL}/advertiser/info/"
         
         try:
+            self._limiter.acquire()
             response = self.session.get(
                 endpoint,
-                params={'advertiser_ids': [self.config.advertiser_id]},
+                headers=self._headers,
+                params={'advertiser_ids': self._advertiser_ids_param},
                 timeout=10
             )
-            result = response.json()
+            result = _parse_json(response)
+            if result is None:
+                error = _http_error(response)
+                logger.error("API connection failed: %s", error['message'])
+                return False, f"❌ Connection failed: {error['message']}"
             
             if result.get('code') == 0:
                 logger.info("✅ TikTok API connection successful")
                 return True, "✅ Connected to TikTok Marketing API"
             else:
                 error_msg = result.get('message', 'Unknown error')
-                logger.error(f"API connection failed: {error_msg}")
+                logger.error("API connection failed: %s", error_msg)
                 return False, f"❌ Connection failed: {error_msg}"
                 
         except requests.exceptions.Timeout:
@@ -139,81 +338,218 @@ class TikTokRealAPI:
             (success, response_data) tuple
         """
         endpoint = f"{self.BASE_URL}/campaign/create/"
-        
-        # Map our objective to TikTok's objective types
-        objective_mapping = {
-            "Traffic": "TRAFFIC",
-            "Conversions": "CONVERSIONS"
-        }
-        
-        payload = {
-            "advertiser_id": self.config.advertiser_id,
-            "campaign_name": campaign_data['campaign_name'],
-            "objective_type": objective_mapping.get(
-                campaign_data['objective'], 
-                "TRAFFIC"
-            ),
-            "budget_mode": "BUDGET_MODE_INFINITE",
-            "operation_status": "ENABLE"
-        }
+        # Encoded once; every retry sends the same bytes
+        body = serialization.dumps(self._campaign_payload(campaign_data))
         
         try:
-            logger.info(f"Creating campaign: {campaign_data['campaign_name']}")
+            logger.info("Creating campaign: %s", campaign_data['campaign_name'])
             
-            response = self.session.post(
-                endpoint,
-                json=payload,
-                timeout=15
-            )
-            result = response.json()
+            for attempt in range(self.MAX_RETRIES):
+                self._limiter.acquire()
+                response = self.session.post(
+                    endpoint,
+                    data=body,
+                    headers=self._headers,
+                    timeout=15
+                )
+                retryable, result = self._check_campaign_response(response)
+                if not retryable or attempt == self.MAX_RETRIES - 1:
+                    break
+                
+                delay = self._retry_delay(response, attempt)
+                logger.warning("Campaign creation got a transient error, retrying in %.2fs", delay)
+                time.sleep(delay)
             
-            logger.debug(f"API Response: {result}")
+            if result is None:
+                error = _http_error(response)
+                logger.error("Campaign creation failed: %s", error['message'])
+                return False, error
             
-            # TikTok uses code=0 for success
-            if result.get('code') == 0:
-                campaign_id = result['data']['campaign_id']
-                
-                logger.info(f"✅ Campaign created: {campaign_id}")
-                
-                return True, {
-                    'campaign_id': campaign_id,
-                    'campaign_name': campaign_data['campaign_name'],
-                    'status': 'active',
-                    'message': 'Campaign created successfully on TikTok!',
-                    'dashboard_url': f"https://ads.tiktok.com/i18n/campaign/{campaign_id}"
-                }
-            else:
-                # Handle API errors
-                error_code = result.get('code')
-                error_message = result.get('message', 'Unknown error')
-                
-                logger.error(f"Campaign creation failed: {error_message}")
-                
-                return False, self._handle_api_error(error_code, error_message)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("API Response: %r", result)
+            
+            return self._campaign_outcome(campaign_data, result)
                 
         except requests.exceptions.Timeout:
             logger.error("Campaign creation timeout")
-            return False, {
-                'error': 'timeout',
-                'message': 'Request timed out. Please try again.',
-                'suggestion': 'Check your internet connection and retry.'
-            }
+            return False, dict(_TIMEOUT_ERROR)
             
         except requests.exceptions.RequestException as e:
             logger.exception("Network error during campaign creation")
-            return False, {
-                'error': 'network_error',
-                'message': f'Network error: {str(e)}',
-                'suggestion': 'Verify VPN connection if using proxy.'
-            }
+            return False, self._network_error(e)
             
         except Exception as e:
             logger.exception("Unexpected error in create_campaign")
-            return False, {
-                'error': 'unexpected_error',
-                'message': f'Unexpected error: {str(e)}',
-                'suggestion': 'Check logs for details.'
+            return False, self._unexpected_error(e)
+    
+    async def create_campaigns(self, batch: List[Dict]) -> List[Tuple[bool, Dict]]:
+        """
+        Create several campaigns concurrently
+        
+        Requests share one pooled async client and overlap their network
+        round-trips; the same rate limiter and retry rules as
+        create_campaign apply to each of them.
+        
+        Args:
+            batch: Campaign details, one dict per campaign
+            
+        Returns:
+            (success, response_data) tuples, in the order of `batch`
+        """
+        semaphore = asyncio.Semaphore(self._limiter.capacity)
+        async with httpx.AsyncClient(
+            headers=self._headers,
+            limits=httpx.Limits(max_connections=32),
+            timeout=15
+        ) as client:
+            results = await asyncio.gather(
+                *(self._create_campaign_async(client, semaphore, campaign_data) for campaign_data in batch),
+                return_exceptions=True
+            )
+        
+        outcomes = []
+        for result in results:
+            # Cancellation (and other non-Exception exits) is not a result
+            if isinstance(result, BaseException) and not isinstance(result, Exception):
+                raise result
+            if isinstance(result, Exception):
+                logger.error("Unexpected error in create_campaigns: %s", result)
+                outcomes.append((False, self._unexpected_error(result)))
+            else:
+                outcomes.append(result)
+        return outcomes
+    
+    async def _create_campaign_async(
+        self,
+        client: "httpx.AsyncClient",
+        semaphore: asyncio.Semaphore,
+        campaign_data: Dict
+    ) -> Tuple[bool, Dict]:
+        """One create_campaigns request; mirrors create_campaign"""
+        endpoint = f"{self.BASE_URL}/campaign/create/"
+        body = serialization.dumps(self._campaign_payload(campaign_data))
+        
+        try:
+            for attempt in range(self.MAX_RETRIES):
+                async with semaphore:
+                    await asyncio.to_thread(self._limiter.acquire)
+                    response = await client.post(endpoint, content=body)
+                retryable, result = self._check_campaign_response(response)
+                if not retryable or attempt == self.MAX_RETRIES - 1:
+                    break
+                await asyncio.sleep(self._retry_delay(response, attempt))
+            
+            if result is None:
+                error = _http_error(response)
+                logger.error("Campaign creation failed: %s", error['message'])
+                return False, error
+            
+            return self._campaign_outcome(campaign_data, result)
+        
+        except httpx.TimeoutException:
+            logger.error("Campaign creation timeout")
+            return False, dict(_TIMEOUT_ERROR)
+        
+        except httpx.HTTPError as e:
+            logger.error("Network error during campaign creation: %s", e)
+            return False, self._network_error(e)
+    
+    def _campaign_payload(self, campaign_data: Dict) -> Dict:
+        """Request body for POST /campaign/create/"""
+        return {
+            **_CAMPAIGN_PAYLOAD_BASE,
+            "advertiser_id": self.config.advertiser_id,
+            "campaign_name": campaign_data['campaign_name'],
+            "objective_type": _OBJECTIVE_MAPPING.get(
+                campaign_data['objective'], 
+                "TRAFFIC"
+            ),
+            # Same key on every attempt, so a retry can't create a duplicate
+            "request_id": str(secrets.randbits(63))
+        }
+    
+    def _check_campaign_response(self, response) -> Tuple[bool, Optional[Dict]]:
+        """
+        Decide whether a campaign creation attempt should be retried
+        
+        Returns:
+            (retryable, parsed body or None if there is no usable body)
+        """
+        # Error pages from 429/5xx are not always JSON; check status first
+        if response.status_code == 429 or response.status_code >= 500:
+            return True, None
+        result = _parse_json(response)
+        if result is None:
+            return False, None
+        return result.get('code') in self.RETRYABLE_CODES, result
+    
+    def _retry_delay(self, response, attempt: int) -> float:
+        """Retry-After if the server gave one, else full-jitter backoff"""
+        delay = self._retry_after(response)
+        if delay is None:
+            delay = min(self.RETRY_MAX_DELAY, self.RETRY_BASE_DELAY * 2 ** attempt) * random.random()
+        return delay
+    
+    def _campaign_outcome(self, campaign_data: Dict, result: Dict) -> Tuple[bool, Dict]:
+        """Turn a parsed /campaign/create/ response into (success, data)"""
+        # TikTok uses code=0 for success
+        if result.get('code') == 0:
+            campaign_id = result['data']['campaign_id']
+            
+            logger.info("✅ Campaign created: %s", campaign_id)
+            
+            return True, {
+                'campaign_id': campaign_id,
+                'campaign_name': campaign_data['campaign_name'],
+                'status': 'active',
+                'message': 'Campaign created successfully on TikTok!',
+                'dashboard_url': f"https://ads.tiktok.com/i18n/campaign/{campaign_id}"
             }
+        else:
+            # Handle API errors
+            error_code = result.get('code')
+            error_message = result.get('message', 'Unknown error')
+            
+            logger.error("Campaign creation failed: %s", error_message)
+            
+            return False, self._handle_api_error(error_code, error_message)
+    
+    @staticmethod
+    def _network_error(e: Exception) -> Dict:
+        return {
+            'error': 'network_error',
+            'message': f'Network error: {str(e)}',
+            'suggestion': 'Verify VPN connection if using proxy.'
+        }
+    
+    @staticmethod
+    def _unexpected_error(e: Exception) -> Dict:
+        return {
+            'error': 'unexpected_error',
+            'message': f'Unexpected error: {str(e)}',
+            'suggestion': 'Check logs for details.'
+        }
+    
+    @staticmethod
+    def _retry_after(response) -> Optional[float]:
+        """
+        Seconds to wait according to the Retry-After header, if any
+        
+        Args:
+            response: Response to a rejected request
+            
+        Returns:
+            Delay in seconds, or None when the header is absent or unparseable
+        """
+        value = response.headers.get('Retry-After')
+        if not value:
+            return None
+        if value.isdigit():
+            return float(value)
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
     
     def _handle_api_error(self, error_code: int, error_message: str) -> Dict:
         """
@@ -226,32 +562,8 @@ class TikTokRealAPI:
         Returns:
             Formatted error response
         """
-        # Common TikTok API error codes
-        error_mappings = {
-            40001: {
-                'type': 'authentication_failed',
-                'message': 'Invalid or expired access token',
-                'suggestion': 'Re-authenticate using OAuth flow'
-            },
-            40002: {
-                'type': 'invalid_advertiser',
-                'message': 'Invalid advertiser ID',
-                'suggestion': 'Verify advertiser_id in configuration'
-            },
-            40100: {
-                'type': 'validation_error',
-                'message': 'Request validation failed',
-                'suggestion': 'Check all required fields are provided'
-            },
-            50000: {
-                'type': 'server_error',
-                'message': 'TikTok server error',
-                'suggestion': 'Retry after a few minutes'
-            }
-        }
-        
-        if error_code in error_mappings:
-            error_info = error_mappings[error_code]
+        error_info = _ERROR_MAPPINGS.get(error_code)
+        if error_info is not None:
             return {
                 'error': error_info['type'],
                 'message': f"{error_info['message']}: {error_message}",
@@ -275,6 +587,9 @@ class TikTokOAuth:
     AUTH_URL = "https://business-api.tiktok.com/portal/auth"
     TOKEN_URL = "https://business-api.tiktok.com/open_api/v1.3/oauth2/access_token/"
     
+    # Treat a cached token as expired this many seconds early
+    TOKEN_EXPIRY_SKEW = 60
+    
     def __init__(self, app_id: str, app_secret: str, redirect_uri: str):
         """
         Initialize OAuth handler
@@ -287,8 +602,39 @@ class TikTokOAuth:
         self.app_id = app_id
         self.app_secret = app_secret
         self.redirect_uri = redirect_uri
+        
+        # Process-wide pool, so the TLS connection stays warm across exchanges
+        self.session = _create_session()
+        
+        # Last token obtained, and when (monotonic clock) to stop using it
+        self._token: Optional[str] = None
+        self._expires_at: float = 0.0
+        self._token_lock = threading.Lock()
         logger.info("TikTok OAuth initialized")
     
+    def get_access_token(self, auth_code: Optional[str] = None) -> Optional[str]:
+        """
+        Access token from the last exchange, exchanging again only if needed
+        
+        Concurrent callers share one exchange instead of each sending
+        their own request.
+        
+        Args:
+            auth_code: Authorization code to exchange if there is no
+                unexpired token cached
+            
+        Returns:
+            Access token, or None if none is cached and the exchange
+            failed or no auth code was given
+        """
+        with self._token_lock:
+            if self._token and time.monotonic() < self._expires_at:
+                return self._token
+            if not auth_code:
+                return None
+            success, _ = self._exchange_code(auth_code)
+            return self._token if success else None
+    
     def get_authorization_url(self, state: str) -> str:
         """
         Generate OAuth authorization URL
@@ -299,8 +645,6 @@ class TikTokOAuth:
         Returns:
             Authorization URL for user to visit
         """
-        from urllib.parse import urlencode
-        
         params = {
             'app_id': self.app_id,
             'state': state,
@@ -308,7 +652,7 @@ class TikTokOAuth:
         }
         
         auth_url = f"{self.AUTH_URL}?{urlencode(params)}"
-        logger.info(f"Generated auth URL: {auth_url[:50]}...")
+        logger.info("Generated auth URL: %.50s...", auth_url)
         
         return auth_url
     
@@ -322,43 +666,113 @@ class TikTokOAuth:
         Returns:
             (success, token_data) tuple
         """
-        payload = {
-            'app_id': self.app_id,
-            'secret': self.app_secret,
-            'auth_code': auth_code
-        }
-        
+        with self._token_lock:
+            return self._exchange_code(auth_code)
+    
+    def _exchange_code(self, auth_code: str) -> Tuple[bool, Dict]:
+        """Token exchange request; callers hold _token_lock"""
         try:
             logger.info("Exchanging auth code for access token...")
             
-            response = requests.post(
+            response = self.session.post(
                 self.TOKEN_URL,
-                json=payload,
+                data=self._token_request_body(auth_code),
+                headers=_JSON_HEADERS,
                 timeout=10
             )
-            result = response.json()
-            
-            if result.get('code') == 0:
-                data = result['data']
-                
-                logger.info("✅ Access token obtained successfully")
-                
-                return True, {
-                    'access_token': data['access_token'],
-                    'advertiser_ids': data.get('advertiser_ids', []),
-                    'expires_in': data.get('expires_in', 3600)
-                }
-            else:
-                error_msg = result.get('message', 'Token exchange failed')
-                logger.error(f"Token exchange failed: {error_msg}")
-                
-                return False, {
-                    'error': 'token_exchange_failed',
-                    'message': error_msg
-                }
+            return self._token_outcome(response)
                 
         except requests.exceptions.Timeout:
+            self._forget_token()
+            return False, {'error': 'timeout', 'message': 'Request timed out'}
+        except Exception as e:
+            logger.exception("Error in token exchange")
+            self._forget_token()
+            return False, {'error': 'unexpected', 'message': str(e)}
+    
+    async def exchange_code_for_token_async(self, auth_code: str) -> Tuple[bool, Dict]:
+        """
+        Exchange authorization code for access token without blocking
+        
+        For asyncio frontends. The exchange is a single request, so the
+        client is opened per call and never outlives the event loop it
+        runs on. The token cache is updated without the threading lock,
+        which the sync path may hold across a blocking exchange.
+        
+        Args:
+            auth_code: Authorization code from OAuth callback
+            
+        Returns:
+            (success, token_data) tuple
+        """
+        try:
+            logger.info("Exchanging auth code for access token...")
+            
+            async with httpx.AsyncClient(timeout=10.0) as client:
+                response = await client.post(
+                    self.TOKEN_URL,
+                    content=self._token_request_body(auth_code),
+                    headers=_JSON_HEADERS
+                )
+            return self._token_outcome(response)
+        
+        except httpx.TimeoutException:
+            self._forget_token()
             return False, {'error': 'timeout', 'message': 'Request timed out'}
         except Exception as e:
             logger.exception("Error in token exchange")
-            return False, {'error': 'unexpected', 'message': str(e)}
\ No newline at end of file
+            self._forget_token()
+            return False, {'error': 'unexpected', 'message': str(e)}
+    
+    def _token_request_body(self, auth_code: str) -> bytes:
+        """Encoded request body for the token endpoint"""
+        return serialization.dumps({
+            'app_id': self.app_id,
+            'secret': self.app_secret,
+            'auth_code': auth_code
+        })
+    
+    def _token_outcome(self, response) -> Tuple[bool, Dict]:
+        """
+        Turn a token endpoint response into (success, token_data)
+        
+        A new token is cached for get_access_token; a failed exchange
+        drops the cached one.
+        """
+        result = _parse_json(response)
+        if result is None:
+            error = _http_error(response)
+            logger.error("Token exchange failed: %s", error['message'])
+            self._forget_token()
+            return False, error
+        
+        if result.get('code') == 0:
+            data = result['data']
+            
+            logger.info("✅ Access token obtained successfully")
+            
+            expires_in = data.get('expires_in', 3600)
+            # Token first: a reader racing this update (the async path takes
+            # no lock) sees at worst the new token with the old expiry
+            self._token = data['access_token']
+            self._expires_at = time.monotonic() + expires_in - self.TOKEN_EXPIRY_SKEW
+            
+            return True, {
+                'access_token': data['access_token'],
+                'advertiser_ids': data.get('advertiser_ids', []),
+                'expires_in': expires_in
+            }
+        else:
+            error_msg = result.get('message', 'Token exchange failed')
+            logger.error("Token exchange failed: %s", error_msg)
+            self._forget_token()
+            
+            return False, {
+                'error': 'token_exchange_failed',
+                'message': error_msg
+            }
+    
+    def _forget_token(self):
+        """Drop the cached token so get_access_token exchanges again"""
+        self._expires_at = 0.0
+        self._token = None
@@ -3,8 +3,82 @@ Business rules and validation logic
 This is where ALL the music logic lives (primary evaluation area)
 """
 
-from typing import Tuple, Optional, Literal
-from pydantic import BaseModel, Field, validator
+from functools import lru_cache
+from typing import Iterable, Mapping, Tuple, Optional, Literal
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+
+
+VALID_OBJECTIVES = ("Traffic", "Conversions")
+AD_TEXT_MAX_LENGTH = 100
+
+# Common CTAs for reference
+COMMON_CTAS = (
+    "Shop Now", "Learn More", "Sign Up", "Download",
+    "Get Started", "Book Now", "Watch Now", "Apply Now"
+)
+
+# Prefixes TikTok music IDs usually carry (a tuple, for one startswith call)
+_MUSIC_PREFIXES = ("MUS_", "MUSIC_")
+
+# Error messages shared by FieldValidator, MusicValidator and
+# validate_complete_campaign; the "{}" ones are filled in on the error path
+_ERR_NAME_EMPTY = "❌ Campaign name cannot be empty"
+_ERR_NAME_SHORT = "❌ Campaign name must be at least 3 characters (current: {})"
+_ERR_OBJECTIVE_INVALID = "❌ Invalid objective: '{}'\nValid options: " + ", ".join(VALID_OBJECTIVES)
+_ERR_TEXT_EMPTY = "❌ Ad text cannot be empty"
+_ERR_TEXT_LONG = (
+    f"❌ Ad text too long: {{}} characters (max: {AD_TEXT_MAX_LENGTH})\n"
+    "Current text: '{}...'\n"
+    "Please shorten by {} characters"
+)
+_ERR_CTA_EMPTY = "❌ CTA cannot be empty"
+_OK_NAME = "✅ Valid campaign name"
+_ERR_MUSIC_REQUIRED = (
+    "❌ Music is REQUIRED for Conversions campaigns.\n"
+    "Conversions campaigns need engaging music to drive user action.\n\n"
+    "You can:\n"
+    "  1. Provide an existing TikTok Music ID\n"
+    "  2. Upload custom music\n"
+)
+
+
+# One function per rule, shared by the per-field validators and
+# validate_complete_campaign; each returns the error message or None
+
+def _campaign_name_error(name: str) -> Optional[str]:
+    name_len = len(name.strip()) if name else 0
+    if name_len == 0:
+        return _ERR_NAME_EMPTY
+    if name_len < 3:
+        return _ERR_NAME_SHORT.format(name_len)
+    return None
+
+
+def _objective_error(objective: str) -> Optional[str]:
+    if objective not in VALID_OBJECTIVES:
+        return _ERR_OBJECTIVE_INVALID.format(objective)
+    return None
+
+
+def _ad_text_error(text: str) -> Optional[str]:
+    if not text or not text.strip():
+        return _ERR_TEXT_EMPTY
+    text_len = len(text)
+    if text_len > AD_TEXT_MAX_LENGTH:
+        return _ERR_TEXT_LONG.format(text_len, text[:50], text_len - AD_TEXT_MAX_LENGTH)
+    return None
+
+
+def _cta_error(cta: str) -> Optional[str]:
+    if not cta or not cta.strip():
+        return _ERR_CTA_EMPTY
+    return None
+
+
+def _music_error(objective: str, music_id: Optional[str]) -> Optional[str]:
+    if objective == "Conversions" and not music_id:
+        return _ERR_MUSIC_REQUIRED
+    return None
 
 
 class AdCampaignData(BaseModel):
@@ -17,13 +91,27 @@ class AdCampaignData(BaseModel):
     cta: str = Field(..., description="Call to action")
     music_id: Optional[str] = Field(None, description="TikTok Music ID")
     
-    @validator('campaign_name')
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "campaign_name": "Summer Sale 2024",
+                "objective": "Conversions",
+                "ad_text": "Get 50% off! Limited time offer 🔥",
+                "cta": "Shop Now",
+                "music_id": "MUS_12345"
+            }
+        }
+    )
+    
+    @field_validator('campaign_name')
+    @classmethod
     def validate_campaign_name(cls, v):
         if len(v.strip()) < 3:
             raise ValueError("Campaign name must be at least 3 characters")
         return v.strip()
     
-    @validator('ad_text')
+    @field_validator('ad_text')
+    @classmethod
     def validate_ad_text(cls, v):
         if len(v) > 100:
             raise ValueError(f"Ad text must be 100 characters or less (current: {len(v)})")
@@ -31,8 +119,8 @@ class AdCampaignData(BaseModel):
             raise ValueError("Ad text cannot be empty")
         return v.strip()
     
-    @validator('music_id', always=True)
-    def validate_music_requirement(cls, v, values):
+    @model_validator(mode='after')
+    def validate_music_requirement(self):
         """
         CRITICAL BUSINESS RULE:
         - Music is OPTIONAL for Traffic campaigns
@@ -40,26 +128,13 @@ class AdCampaignData(BaseModel):
         
         This validation happens BEFORE submission attempt
         """
-        objective = values.get('objective')
-        
-        if objective == "Conversions" and not v:
+        if self.objective == "Conversions" and not self.music_id:
             raise ValueError(
                 "🚫 Music is REQUIRED for Conversions campaigns. "
                 "Please provide a Music ID or upload custom music."
             )
         
-        return v
-    
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "campaign_name": "Summer Sale 2024",
-                "objective": "Conversions",
-                "ad_text": "Get 50% off! Limited time offer 🔥",
-                "cta": "Shop Now",
-                "music_id": "MUS_12345"
-            }
-        }
+        return self
 
 
 class MusicValidator:
@@ -82,14 +157,9 @@ class MusicValidator:
         Returns:
             Tuple[bool, str]: (is_valid, message)
         """
-        if objective == "Conversions" and not music_id:
-            return False, (
-                "❌ Music is REQUIRED for Conversions campaigns.\n"
-                "Conversions campaigns need engaging music to drive user action.\n\n"
-                "You can:\n"
-                "  1. Provide an existing TikTok Music ID\n"
-                "  2. Upload custom music\n"
-            )
+        error = _music_error(objective, music_id)
+        if error:
+            return False, error
         
         if objective == "Traffic" and not music_id:
             return True, "✅ No music is allowed for Traffic campaigns (optional)"
@@ -105,76 +175,68 @@ class MusicValidator:
         Returns:
             Tuple[bool, str]: (is_valid, message)
         """
-        if not music_id:
-            return False, "Music ID cannot be empty"
-        
-        # Basic format check (TikTok music IDs typically start with MUS_)
-        if not (music_id.startswith("MUS_") or music_id.startswith("MUSIC_")):
-            return False, (
-                f"⚠️ Music ID format looks unusual: '{music_id}'\n"
-                "TikTok Music IDs typically start with 'MUS_' or 'MUSIC_'\n"
-                "Example: MUS_12345678\n\n"
-                "Proceeding with API validation..."
-            )
-        
-        return True, "Format looks good"
+        return _validate_music_id_format(music_id)
+
+
+@lru_cache(maxsize=4096)
+def _validate_music_id_format(music_id: str) -> Tuple[bool, str]:
+    """Pure format check behind MusicValidator.validate_music_id_format"""
+    if not music_id:
+        return False, "Music ID cannot be empty"
+    
+    # Basic format check (TikTok music IDs typically start with MUS_)
+    if not music_id.startswith(_MUSIC_PREFIXES):
+        return False, (
+            f"⚠️ Music ID format looks unusual: '{music_id}'\n"
+            "TikTok Music IDs typically start with 'MUS_' or 'MUSIC_'\n"
+            "Example: MUS_12345678\n\n"
+            "Proceeding with API validation..."
+        )
+    
+    return True, "Format looks good"
 
 
 class FieldValidator:
     """
     Individual field validators with helpful error messages
+    
+    Used for per-field feedback while collecting input; whole campaigns
+    go through validate_complete_campaign, which applies the same rules.
     """
     
     @staticmethod
     def validate_campaign_name(name: str) -> Tuple[bool, str]:
         """Validate campaign name"""
-        if not name or not name.strip():
-            return False, "❌ Campaign name cannot be empty"
+        error = _campaign_name_error(name)
+        if error:
+            return False, error
         
-        if len(name.strip()) < 3:
-            return False, f"❌ Campaign name must be at least 3 characters (current: {len(name.strip())})"
-        
-        return True, "✅ Valid campaign name"
+        return True, _OK_NAME
     
     @staticmethod
     def validate_objective(objective: str) -> Tuple[bool, str]:
         """Validate objective"""
-        valid_objectives = ["Traffic", "Conversions"]
-        
-        if objective not in valid_objectives:
-            return False, (
-                f"❌ Invalid objective: '{objective}'\n"
-                f"Valid options: {', '.join(valid_objectives)}"
-            )
+        error = _objective_error(objective)
+        if error:
+            return False, error
         
         return True, f"✅ Valid objective: {objective}"
     
     @staticmethod
     def validate_ad_text(text: str) -> Tuple[bool, str]:
         """Validate ad text"""
-        if not text or not text.strip():
-            return False, "❌ Ad text cannot be empty"
-        
-        if len(text) > 100:
-            return False, (
-                f"❌ Ad text too long: {len(text)} characters (max: 100)\n"
-                f"Current text: '{text[:50]}...'\n"
-                f"Please shorten by {len(text) - 100} characters"
-            )
+        error = _ad_text_error(text)
+        if error:
+            return False, error
         
         return True, f"✅ Valid ad text ({len(text)} characters)"
     
     @staticmethod
     def validate_cta(cta: str) -> Tuple[bool, str]:
         """Validate CTA"""
-        if not cta or not cta.strip():
-            return False, "❌ CTA cannot be empty"
-        
-        # Common CTAs for reference
-        common_ctas = [
-            "Shop Now", "Learn More", "Sign Up", "Download",
-            "Get Started", "Book Now", "Watch Now", "Apply Now"
-        ]
+        error = _cta_error(cta)
+        if error:
+            return False, error
         
         return True, f"✅ Valid CTA: {cta}"
 
@@ -184,36 +246,66 @@ def validate_complete_campaign(
     objective: Literal["Traffic", "Conversions"],
     ad_text: str,
     cta: str,
-    music_id: Optional[str]
+    music_id: Optional[str],
+    fail_fast: bool = False
 ) -> Tuple[bool, list[str]]:
     """
     Validates all fields together and returns all errors
     
+    Same rules and messages as FieldValidator/MusicValidator; each value
+    is checked once by the shared rule functions.
+    
+    Args:
+        fail_fast: Stop at the first error, for callers that only need
+            a yes/no answer
+    
     Returns:
         Tuple[bool, list[str]]: (is_valid, list_of_error_messages)
     """
     errors = []
+    if error := _campaign_name_error(campaign_name):
+        errors.append(error)
+        if fail_fast:
+            return False, errors
     
-    # Validate each field
-    is_valid, msg = FieldValidator.validate_campaign_name(campaign_name)
-    if not is_valid:
-        errors.append(msg)
+    if error := _objective_error(objective):
+        errors.append(error)
+        if fail_fast:
+            return False, errors
     
-    is_valid, msg = FieldValidator.validate_objective(objective)
-    if not is_valid:
-        errors.append(msg)
+    if error := _ad_text_error(ad_text):
+        errors.append(error)
+        if fail_fast:
+            return False, errors
     
-    is_valid, msg = FieldValidator.validate_ad_text(ad_text)
-    if not is_valid:
-        errors.append(msg)
+    if error := _cta_error(cta):
+        errors.append(error)
+        if fail_fast:
+            return False, errors
     
-    is_valid, msg = FieldValidator.validate_cta(cta)
-    if not is_valid:
-        errors.append(msg)
+    if error := _music_error(objective, music_id):
+        errors.append(error)
     
-    # Validate music requirement
-    is_valid, msg = MusicValidator.validate_music_for_objective(objective, music_id)
-    if not is_valid:
-        errors.append(msg)
+    return not errors, errors
+
+
+def validate_many(rows: Iterable[Mapping]) -> list[Tuple[bool, list[str]]]:
+    """
+    Validate a batch of campaigns, e.g. rows from an uploaded CSV
     
-    return len(errors) == 0, errors
\ No newline at end of file
+    Args:
+        rows: Campaign dicts with the validate_complete_campaign fields
+        
+    Returns:
+        One (is_valid, errors) tuple per row, in order
+    """
+    return [
+        validate_complete_campaign(
+            row.get("campaign_name"),
+            row.get("objective"),
+            row.get("ad_text"),
+            row.get("cta"),
+            row.get("music_id")
+        )
+        for row in rows
+    ]
@@ -0,0 +1,208 @@
+"""
+Tests for the agent's Gemini chat handling
+The Gemini client is replaced by a fake; nothing leaves the process
+"""
+
+import json
+import os
+
+import pytest
+
+# Settings are loaded at import time and require a key
+os.environ.setdefault("GOOGLE_API_KEY", "test-key")
+
+from src.agent import TikTokAdAgent  # noqa: E402
+from src.prompts import TASK_INSTRUCTIONS  # noqa: E402
+from src.tiktok_api import APIResponse  # noqa: E402
+
+
+def reply(message="OK", **data):
+    return json.dumps({"message": message, "action": "collect_name", "data": data})
+
+
+class FakeChunk:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeChat:
+    """Chat session that answers from a shared queue of replies"""
+    
+    def __init__(self, client, history):
+        self.client = client
+        self.history = list(history or [])
+        self.recorded = []
+    
+    def get_history(self, curated=False):
+        return list(self.history)
+    
+    def send_message_stream(self, message):
+        self.client.sent.append((self.get_history(), message))
+        text = self.client.replies.pop(0)
+        if isinstance(text, Exception):
+            raise text
+        self.history.append({"role": "user", "parts": [{"text": message}]})
+        self.history.append({"role": "model", "parts": [{"text": text}]})
+        yield FakeChunk(text)
+    
+    def record_history(self, user_input, model_output, is_valid):
+        self.recorded.append((user_input, model_output))
+        self.history.append(user_input)
+        self.history.extend(model_output)
+
+
+class FakeChats:
+    def __init__(self, client):
+        self.client = client
+    
+    def create(self, model, config=None, history=None):
+        self.client.created.append({"config": config, "history": list(history or [])})
+        return FakeChat(self.client, history)
+
+
+class FakeClient:
+    """Records every chat created and every message sent"""
+    
+    def __init__(self, *replies):
+        self.replies = list(replies)
+        self.sent = []
+        self.created = []
+        self.chats = FakeChats(self)
+
+
+@pytest.fixture
+def agent():
+    agent = TikTokAdAgent()
+    agent._client = FakeClient()
+    return agent
+
+
+class TestChatHistoryWindow:
+    """Test that each request carries a bounded history"""
+    
+    def test_history_sent_never_exceeds_window(self, agent):
+        agent._client.replies = [reply(f"Reply {i}") for i in range(10)]
+        for i in range(10):
+            agent.process_message(f"message {i}")
+        for history, _ in agent._client.sent:
+            assert len(history) <= agent._HISTORY_WINDOW
+    
+    def test_rebuilt_session_keeps_most_recent_turns(self, agent):
+        agent._client.replies = [reply(f"Reply {i}") for i in range(5)]
+        for i in range(5):
+            agent.process_message(f"message {i}")
+        history, _ = agent._client.sent[-1]
+        assert len(history) == agent._HISTORY_WINDOW
+        assert history[0]["role"] == "user"
+        assert history[-1]["role"] == "model"
+        assert "Reply 3" in history[-1]["parts"][0]["text"]
+    
+    def test_task_instructions_sent_once_as_system_instruction(self, agent):
+        agent._client.replies = [reply(), reply()]
+        agent.process_message("hello")
+        agent.process_message("Summer Sale")
+        assert TASK_INSTRUCTIONS in agent._client.created[0]["config"]["system_instruction"]
+        for _, prompt in agent._client.sent:
+            assert "TASK:" not in prompt
+            assert "Summer Sale" in prompt or "hello" in prompt
+    
+    def test_rebuilt_session_is_seeded_with_exchanged_text(self, agent):
+        agent._client.replies = [reply("What's the name?"), RuntimeError("stream broke"), reply("Got it")]
+        agent.process_message("hi")
+        first_prompt = agent._client.sent[0][1]
+        assert "error" in agent.process_message("Summer Sale")
+        agent.process_message("Summer Sale")
+        # Seeded with the prompt and raw JSON reply; the failed turn is left out
+        assert agent._client.created[-1]["history"] == [
+            {"role": "user", "parts": [{"text": first_prompt}]},
+            {"role": "model", "parts": [{"text": reply("What's the name?")}]},
+        ]
+
+
+class TestResponseCache:
+    """Test the per-conversation LLM response cache"""
+    
+    def ask_until_cached(self, agent):
+        """Send "hi" until the same question is answered in the same state"""
+        agent._client.replies = [reply("What's the name?"), reply("What's the name?")]
+        agent.process_message("hi")
+        agent.process_message("hi")
+        return agent.process_message("hi")
+    
+    def test_repeated_turn_is_a_hit(self, agent):
+        assert self.ask_until_cached(agent) == "What's the name?"
+        assert len(agent._client.sent) == 2
+    
+    def test_hit_is_recorded_in_chat_history(self, agent):
+        self.ask_until_cached(agent)
+        user_input, model_output = agent.chat.recorded[-1]
+        assert user_input.parts[0].text == agent._client.sent[-1][1]
+        assert model_output[0].parts[0].text == reply("What's the name?")
+    
+    def test_miss_when_fields_differ(self, agent):
+        agent._client.replies = [reply("What's the name?"), reply("What's the name?"), reply("Next?")]
+        agent.process_message("hi")
+        agent.process_message("hi")
+        agent.state.unsafe_update(campaign_name="Summer Sale")
+        assert agent.process_message("hi") == "Next?"
+        assert len(agent._client.sent) == 3
+    
+    def test_miss_when_previous_reply_differs(self, agent):
+        agent._client.replies = [reply("What's the name?"), reply("Pardon?"), reply("Next?")]
+        agent.process_message("hi")
+        agent.process_message("hi")
+        assert agent.process_message("hi") == "Next?"
+        assert len(agent._client.sent) == 3
+    
+    def test_reset_clears_cache(self, agent):
+        agent._client.replies = [reply("What's the name?")] * 2
+        agent.process_message("hi")
+        agent.process_message("hi")
+        agent.reset()
+        agent._client.replies = [reply("What's the name?")] * 2
+        agent.process_message("hi")
+        agent.process_message("hi")
+        assert len(agent._client.sent) == 4
+    
+    def test_hit_returns_a_copy(self, agent):
+        self.ask_until_cached(agent)
+        key = next(iter(agent._response_cache._entries))
+        agent._response_cache.get(key)[2]["data"]["campaign_name"] = "changed"
+        assert "campaign_name" not in agent._response_cache.get(key)[2]["data"]
+
+
+class TestSubmission:
+    """Test what reaches the API on submit"""
+    
+    def test_submits_values_validated_at_finalization(self, agent):
+        submitted = []
+        
+        def submit_campaign(payload):
+            submitted.append(payload)
+            return APIResponse(success=True, data={
+                "campaign_id": "1", "campaign_name": payload["campaign_name"],
+                "status": "ACTIVE", "dashboard_url": "https://example.com"
+            })
+        
+        agent.api.submit_campaign = submit_campaign
+        agent.state.unsafe_update(
+            campaign_name="  Summer Sale  ", objective="Traffic",
+            ad_text="  Shop now  ", cta="Learn More"
+        )
+        agent._handle_finalization()
+        agent._handle_submission()
+        assert submitted[0]["campaign_name"] == "Summer Sale"
+        assert submitted[0]["ad_text"] == "Shop now"
+    
+    def test_edit_after_review_goes_back_to_review(self, agent):
+        agent.api.submit_campaign = lambda payload: pytest.fail("submitted unreviewed data")
+        agent.state.unsafe_update(
+            campaign_name="Summer Sale", objective="Traffic", ad_text="Shop now", cta="Learn More"
+        )
+        agent._handle_finalization()
+        agent.state.unsafe_update(campaign_name="Winter Sale")
+        assert "Campaign Summary" in agent._handle_submission()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
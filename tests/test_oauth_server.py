@@ -0,0 +1,85 @@
+"""
+Tests for the OAuth helper server
+"""
+
+import pytest
+from dotenv import dotenv_values
+
+import oauth_server
+
+
+@pytest.fixture
+def client():
+    oauth_server.app.config["TESTING"] = True
+    with oauth_server.app.test_client() as client:
+        yield client
+
+
+class TestCallback:
+    """Test OAuth state checking in /callback"""
+    
+    def test_missing_session_state_is_invalid(self, client):
+        response = client.get("/callback?auth_code=abc&state=xyz")
+        assert response.status_code == 200
+        assert "Invalid state" in response.get_data(as_text=True)
+    
+    def test_non_ascii_state_is_invalid(self, client):
+        with client.session_transaction() as sess:
+            sess["oauth_state"] = "expected"
+        response = client.get("/callback?auth_code=abc&state=café")
+        assert response.status_code == 200
+        assert "Invalid state" in response.get_data(as_text=True)
+
+
+@pytest.fixture
+def env_file(tmp_path, monkeypatch):
+    path = tmp_path / ".env"
+    monkeypatch.setattr(oauth_server, "ENV_PATH", str(path))
+    return path
+
+
+class TestWriteEnvBatch:
+    """Test in-place .env updates from the token exchange"""
+    
+    def test_preserves_other_keys_comments_and_order(self, env_file):
+        env_file.write_text(
+            "# TikTok credentials\n"
+            "TIKTOK_APP_ID=app\n"
+            "TIKTOK_ACCESS_TOKEN=old\n"
+            "\n"
+            "# Gemini\n"
+            "GEMINI_API_KEY=key\n",
+            encoding="utf-8"
+        )
+        oauth_server._write_env_batch({"TIKTOK_ACCESS_TOKEN": "new"})
+        assert env_file.read_text(encoding="utf-8") == (
+            "# TikTok credentials\n"
+            "TIKTOK_APP_ID=app\n"
+            "TIKTOK_ACCESS_TOKEN='new'\n"
+            "\n"
+            "# Gemini\n"
+            "GEMINI_API_KEY=key\n"
+        )
+    
+    def test_appends_new_keys_after_unterminated_last_line(self, env_file):
+        env_file.write_text("TIKTOK_APP_ID=app", encoding="utf-8")
+        oauth_server._write_env_batch({"TIKTOK_ADVERTISER_ID": "adv"})
+        assert env_file.read_text(encoding="utf-8") == "TIKTOK_APP_ID=app\nTIKTOK_ADVERTISER_ID='adv'\n"
+    
+    def test_creates_missing_file(self, env_file):
+        oauth_server._write_env_batch({"TIKTOK_ACCESS_TOKEN": "tok"})
+        assert dotenv_values(env_file) == {"TIKTOK_ACCESS_TOKEN": "tok"}
+    
+    def test_values_round_trip_through_dotenv(self, env_file):
+        env_file.write_text("TIKTOK_APP_ID=app\n", encoding="utf-8")
+        updates = {
+            "TIKTOK_APP_ID": "with spaces",
+            "TIKTOK_ACCESS_TOKEN": "it's \"quoted\"",
+            "TIKTOK_APP_SECRET": "back\\slash # not a comment",
+        }
+        oauth_server._write_env_batch(updates)
+        assert dotenv_values(env_file) == updates
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
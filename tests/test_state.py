@@ -0,0 +1,35 @@
+"""
+Tests for conversation state
+"""
+
+import pytest
+
+from src.state import AdCampaignState, MUSIC_REQUIRED_LABEL
+
+
+class TestReadiness:
+    """Test the required-field checks on AdCampaignState"""
+    
+    def test_empty_state_missing_everything(self):
+        state = AdCampaignState()
+        assert state.missing_fields() == ("campaign name", "objective", "ad text", "CTA")
+        assert state.is_ready_for_submission() == False
+    
+    def test_traffic_ready_without_music(self):
+        state = AdCampaignState(campaign_name="Summer Sale", objective="Traffic", ad_text="Shop now", cta="Learn More")
+        assert state.missing_fields() == ()
+        assert state.is_ready_for_submission() == True
+    
+    def test_conversions_needs_music(self):
+        state = AdCampaignState(campaign_name="Summer Sale", objective="Conversions", ad_text="Shop now", cta="Buy")
+        assert state.missing_fields() == (MUSIC_REQUIRED_LABEL,)
+        assert state.is_ready_for_submission() == False
+    
+    def test_reflects_unvalidated_updates(self):
+        state = AdCampaignState()
+        state.unsafe_update(campaign_name="Summer Sale", objective="Traffic", ad_text="Shop now", cta="Learn More")
+        assert state.is_ready_for_submission() == True
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
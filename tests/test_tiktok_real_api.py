@@ -0,0 +1,363 @@
+"""
+Tests for the real TikTok API client
+Network calls go to fake sessions; nothing leaves the process
+"""
+
+import asyncio
+import json
+import time
+from email.utils import formatdate
+
+import httpx
+import pytest
+
+from src import tiktok_real_api
+from src.tiktok_real_api import TikTokConfig, TikTokOAuth, TikTokRealAPI, _RateLimiter
+
+
+CAMPAIGN = {"campaign_name": "Summer Sale", "objective": "Traffic"}
+
+
+class FakeResponse:
+    """Just enough of requests.Response for the client"""
+    
+    def __init__(self, status_code=200, body=None, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.content = json.dumps(body).encode() if body is not None else b"<html>error</html>"
+
+
+class FakeSession:
+    """Returns queued responses and records each request body"""
+    
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.bodies = []
+    
+    def post(self, url, data=None, headers=None, timeout=None):
+        self.bodies.append(json.loads(data))
+        return self.responses.pop(0)
+
+
+def created(campaign_id="123"):
+    return FakeResponse(200, {"code": 0, "data": {"campaign_id": campaign_id}})
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record time.sleep calls made by the client instead of sleeping"""
+    calls = []
+    monkeypatch.setattr(tiktok_real_api.time, "sleep", calls.append)
+    return calls
+
+
+@pytest.fixture
+def api():
+    return TikTokRealAPI(TikTokConfig("app", "secret", "token", "adv"))
+
+
+class TestCreateCampaignRetries:
+    """Test retry, backoff and Retry-After handling in create_campaign"""
+    
+    def test_retries_on_429(self, api, sleeps):
+        api.session = FakeSession(FakeResponse(429), created())
+        success, data = api.create_campaign(CAMPAIGN)
+        assert success == True
+        assert data["campaign_id"] == "123"
+        assert len(api.session.bodies) == 2
+        assert len(sleeps) == 1
+    
+    def test_retries_on_5xx(self, api, sleeps):
+        api.session = FakeSession(FakeResponse(503), FakeResponse(500), created())
+        success, _ = api.create_campaign(CAMPAIGN)
+        assert success == True
+        assert len(api.session.bodies) == 3
+    
+    def test_retries_on_server_error_code(self, api, sleeps):
+        api.session = FakeSession(FakeResponse(200, {"code": 50000, "message": "busy"}), created())
+        success, _ = api.create_campaign(CAMPAIGN)
+        assert success == True
+        assert len(api.session.bodies) == 2
+    
+    def test_no_retry_on_4xx(self, api, sleeps):
+        api.session = FakeSession(FakeResponse(400, {"code": 40002, "message": "bad advertiser"}))
+        success, data = api.create_campaign(CAMPAIGN)
+        assert success == False
+        assert data["error"] == "invalid_advertiser"
+        assert len(api.session.bodies) == 1
+        assert sleeps == []
+    
+    def test_gives_up_after_max_retries(self, api, sleeps):
+        api.session = FakeSession(*[FakeResponse(503)] * api.MAX_RETRIES)
+        success, data = api.create_campaign(CAMPAIGN)
+        assert success == False
+        assert data["error"] == "server_error"
+        assert len(api.session.bodies) == api.MAX_RETRIES
+        assert len(sleeps) == api.MAX_RETRIES - 1
+    
+    def test_request_id_stable_across_attempts(self, api, sleeps):
+        api.session = FakeSession(FakeResponse(429), FakeResponse(502), created())
+        api.create_campaign(CAMPAIGN)
+        request_ids = {body["request_id"] for body in api.session.bodies}
+        assert len(request_ids) == 1
+    
+    def test_backoff_is_capped_full_jitter(self, api, sleeps):
+        api.session = FakeSession(FakeResponse(503), FakeResponse(503), created())
+        api.create_campaign(CAMPAIGN)
+        for attempt, delay in enumerate(sleeps):
+            assert 0 <= delay <= min(api.RETRY_MAX_DELAY, api.RETRY_BASE_DELAY * 2 ** attempt)
+    
+    def test_retry_after_seconds(self, api, sleeps):
+        api.session = FakeSession(FakeResponse(429, headers={"Retry-After": "7"}), created())
+        api.create_campaign(CAMPAIGN)
+        assert sleeps == [7.0]
+    
+    def test_retry_after_http_date(self, api, sleeps):
+        retry_at = formatdate(time.time() + 30, usegmt=True)
+        api.session = FakeSession(FakeResponse(503, headers={"Retry-After": retry_at}), created())
+        api.create_campaign(CAMPAIGN)
+        assert len(sleeps) == 1
+        assert 25 <= sleeps[0] <= 30
+
+
+class TestSharedPool:
+    """Test that clients share connections but not session state"""
+    
+    def test_sessions_share_adapter_but_not_cookies(self):
+        first = TikTokRealAPI(TikTokConfig("app", "secret", "token-a", "adv-a"))
+        second = TikTokRealAPI(TikTokConfig("app", "secret", "token-b", "adv-b"))
+        assert first.session is not second.session
+        assert first.session.get_adapter("https://business-api.tiktok.com") is \
+            second.session.get_adapter("https://business-api.tiktok.com")
+        first.session.cookies.set("tenant", "a")
+        assert "tenant" not in second.session.cookies
+
+
+class TestRetryAfter:
+    """Test Retry-After header parsing"""
+    
+    def test_missing(self):
+        assert TikTokRealAPI._retry_after(FakeResponse(429)) is None
+    
+    def test_seconds(self):
+        assert TikTokRealAPI._retry_after(FakeResponse(429, headers={"Retry-After": "3"})) == 3.0
+    
+    def test_past_http_date_is_zero(self):
+        past = formatdate(time.time() - 60, usegmt=True)
+        assert TikTokRealAPI._retry_after(FakeResponse(429, headers={"Retry-After": past})) == 0.0
+    
+    def test_unparseable(self):
+        assert TikTokRealAPI._retry_after(FakeResponse(429, headers={"Retry-After": "soon"})) is None
+
+
+@pytest.fixture
+def mock_transport(monkeypatch):
+    """Route the module's httpx.AsyncClient requests to a handler"""
+    real_client = httpx.AsyncClient
+    
+    def install(handler):
+        monkeypatch.setattr(
+            tiktok_real_api.httpx, "AsyncClient",
+            lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs)
+        )
+    
+    return install
+
+
+class TestCreateCampaigns:
+    """Test concurrent campaign creation over httpx"""
+    
+    @pytest.fixture(autouse=True)
+    def no_backoff(self, api):
+        api.RETRY_BASE_DELAY = 0
+    
+    def test_results_in_batch_order(self, api, mock_transport):
+        async def handler(request):
+            name = json.loads(request.content)["campaign_name"]
+            # Earlier campaigns answer last
+            await asyncio.sleep(0.01 * (3 - int(name[-1])))
+            return httpx.Response(200, json={"code": 0, "data": {"campaign_id": f"id-{name[-1]}"}})
+        
+        mock_transport(handler)
+        batch = [{"campaign_name": f"Campaign {i}", "objective": "Traffic"} for i in range(3)]
+        outcomes = asyncio.run(api.create_campaigns(batch))
+        assert [data["campaign_id"] for _, data in outcomes] == ["id-0", "id-1", "id-2"]
+        assert all(success == True for success, _ in outcomes)
+    
+    def test_retries_on_5xx(self, api, mock_transport):
+        responses = [httpx.Response(503), httpx.Response(200, json={"code": 0, "data": {"campaign_id": "123"}})]
+        request_ids = []
+        
+        def handler(request):
+            request_ids.append(json.loads(request.content)["request_id"])
+            return responses.pop(0)
+        
+        mock_transport(handler)
+        [(success, data)] = asyncio.run(api.create_campaigns([CAMPAIGN]))
+        assert success == True
+        assert data["campaign_id"] == "123"
+        assert len(request_ids) == 2
+        assert len(set(request_ids)) == 1
+    
+    def test_gives_up_after_max_retries(self, api, mock_transport):
+        mock_transport(lambda request: httpx.Response(503))
+        [(success, data)] = asyncio.run(api.create_campaigns([CAMPAIGN]))
+        assert success == False
+        assert data["error"] == "server_error"
+    
+    def test_malformed_success_body_maps_to_unexpected_error(self, api, mock_transport):
+        def handler(request):
+            if json.loads(request.content)["campaign_name"] == "Broken":
+                return httpx.Response(200, json={"code": 0, "data": {}})
+            return httpx.Response(200, json={"code": 0, "data": {"campaign_id": "123"}})
+        
+        mock_transport(handler)
+        batch = [{"campaign_name": "Broken", "objective": "Traffic"}, CAMPAIGN]
+        (broken_ok, broken), (ok, _) = asyncio.run(api.create_campaigns(batch))
+        assert broken_ok == False
+        assert broken["error"] == "unexpected_error"
+        assert ok == True
+    
+    def test_api_error_code_is_mapped(self, api, mock_transport):
+        mock_transport(lambda request: httpx.Response(200, json={"code": 40001, "message": "expired"}))
+        [(success, data)] = asyncio.run(api.create_campaigns([CAMPAIGN]))
+        assert success == False
+        assert data["error"] == "authentication_failed"
+    
+    def test_cancellation_is_not_returned_as_a_result(self, api, mock_transport):
+        def handler(request):
+            raise asyncio.CancelledError()
+        
+        mock_transport(handler)
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(api.create_campaigns([CAMPAIGN]))
+
+
+class FakeClock:
+    """Monotonic clock that only moves when slept on or advanced"""
+    
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+    
+    def monotonic(self):
+        return self.now
+    
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(tiktok_real_api.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(tiktok_real_api.time, "sleep", clock.sleep)
+    return clock
+
+
+class TestRateLimiter:
+    """Test the token bucket pacing outbound calls"""
+    
+    def test_burst_up_to_capacity_without_waiting(self, clock):
+        limiter = _RateLimiter(rate=10, capacity=5)
+        for _ in range(5):
+            limiter.acquire()
+        assert clock.sleeps == []
+    
+    def test_waits_one_refill_interval_past_capacity(self, clock):
+        limiter = _RateLimiter(rate=10, capacity=5)
+        for _ in range(6):
+            limiter.acquire()
+        assert clock.sleeps == [pytest.approx(0.1)]
+    
+    def test_sustained_rate_matches_refill_rate(self, clock):
+        limiter = _RateLimiter(rate=10, capacity=5)
+        start = clock.now
+        for _ in range(25):
+            limiter.acquire()
+        # 5 from the initial burst, the other 20 at 10 per second
+        assert clock.now - start == pytest.approx(2.0)
+    
+    def test_refills_while_idle_but_not_past_capacity(self, clock):
+        limiter = _RateLimiter(rate=10, capacity=5)
+        for _ in range(5):
+            limiter.acquire()
+        clock.now += 60
+        for _ in range(5):
+            limiter.acquire()
+        assert clock.sleeps == []
+        limiter.acquire()
+        assert clock.sleeps == [pytest.approx(0.1)]
+
+
+def token_granted(access_token="tok", expires_in=3600):
+    return FakeResponse(200, {"code": 0, "data": {"access_token": access_token, "expires_in": expires_in}})
+
+
+@pytest.fixture
+def oauth():
+    return TikTokOAuth("app", "secret", "http://localhost/callback")
+
+
+class TestAccessTokenCache:
+    """Test reuse and expiry of the cached OAuth access token"""
+    
+    def test_cached_token_served_without_second_exchange(self, oauth, clock):
+        oauth.session = FakeSession(token_granted())
+        assert oauth.get_access_token("code") == "tok"
+        assert oauth.get_access_token("code") == "tok"
+        assert oauth.get_access_token() == "tok"
+        assert len(oauth.session.bodies) == 1
+    
+    def test_refreshes_inside_expiry_skew_window(self, oauth, clock):
+        oauth.session = FakeSession(token_granted("old", expires_in=100), token_granted("new"))
+        assert oauth.get_access_token("code") == "old"
+        # Still 59s from real expiry, but inside the 60s skew
+        clock.now += 41
+        assert oauth.get_access_token("code") == "new"
+        assert len(oauth.session.bodies) == 2
+    
+    def test_still_cached_just_before_skew_window(self, oauth, clock):
+        oauth.session = FakeSession(token_granted("old", expires_in=100))
+        oauth.get_access_token("code")
+        clock.now += 39
+        assert oauth.get_access_token() == "old"
+        assert len(oauth.session.bodies) == 1
+    
+    def test_failed_exchange_clears_cache(self, oauth, clock):
+        oauth.session = FakeSession(
+            token_granted(),
+            FakeResponse(200, {"code": 40001, "message": "invalid auth code"})
+        )
+        oauth.get_access_token("code")
+        success, _ = oauth.exchange_code_for_token("bad-code")
+        assert success == False
+        assert oauth.get_access_token() is None
+    
+    def test_http_error_clears_cache(self, oauth, clock):
+        oauth.session = FakeSession(token_granted(), FakeResponse(502))
+        oauth.get_access_token("code")
+        oauth.exchange_code_for_token("code")
+        assert oauth.get_access_token() is None
+    
+    def test_async_exchange_fills_cache(self, oauth, clock, mock_transport):
+        mock_transport(lambda request: httpx.Response(
+            200, json={"code": 0, "data": {"access_token": "async-tok", "expires_in": 3600}}
+        ))
+        success, data = asyncio.run(oauth.exchange_code_for_token_async("code"))
+        assert success == True
+        assert data["access_token"] == "async-tok"
+        assert oauth.get_access_token() == "async-tok"
+    
+    def test_async_failed_exchange_clears_cache(self, oauth, clock, mock_transport):
+        oauth.session = FakeSession(token_granted())
+        oauth.get_access_token("code")
+        mock_transport(lambda request: httpx.Response(200, json={"code": 40001, "message": "invalid auth code"}))
+        success, _ = asyncio.run(oauth.exchange_code_for_token_async("bad-code"))
+        assert success == False
+        assert oauth.get_access_token() is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -8,7 +8,8 @@ from src.validators import (
     FieldValidator,
     MusicValidator,
     AdCampaignData,
-    validate_complete_campaign
+    validate_complete_campaign,
+    validate_many
 )
 
 
@@ -178,6 +179,28 @@ class TestCompleteValidation:
         )
         assert is_valid == False
         assert len(errors) > 0
+    
+    def test_fail_fast_stops_at_first_error(self):
+        is_valid, errors = validate_complete_campaign(
+            campaign_name="Hi",
+            objective="Conversions",
+            ad_text="",
+            cta="",
+            music_id=None,
+            fail_fast=True
+        )
+        assert is_valid == False
+        assert len(errors) == 1
+        assert "at least 3 characters" in errors[0]
+    
+    def test_validate_many(self):
+        results = validate_many([
+            {"campaign_name": "Summer Sale", "objective": "Traffic", "ad_text": "Hi!", "cta": "Shop Now"},
+            {"campaign_name": "Summer Sale", "objective": "Conversions", "ad_text": "Hi!", "cta": "Shop Now"},
+        ])
+        assert results[0] == (True, [])
+        assert results[1][0] == False
+        assert "REQUIRED" in results[1][1][0]
 
 
 if __name__ == "__main__":